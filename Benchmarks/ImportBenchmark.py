@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Measures how long each NVLib component takes to import, each in a fresh interpreter so
+# nothing is already cached in sys.modules. Run from the folder that contains NVLib:
+#   python -m NVLib.Benchmarks.ImportBenchmark --output imports.json
+
+PACKAGE = __package__.split('.')[0] if __package__ else 'NVLib'
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+COMPONENTS = ['TinyDB', 'MariaDB', 'Auth', 'AutoGUI', 'TextToSpeech', 'HandTracker', 'FaceHandDetector',
+              'StreamScheduler', 'DetectionEventStream', 'hand_features']
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+from {package}.Components import {name}
+elapsed = time.perf_counter() - start
+heavy = [m for m in ('cv2', 'mediapipe', 'pygame', 'edge_tts', 'firebase_admin', 'customtkinter', 'PIL', 'mariadb')
+         if m in sys.modules]
+print(json.dumps({{'import_ms': elapsed * 1000.0, 'modules': len(sys.modules), 'heavy': heavy}}))
+"""
+
+def measure(name, repeats):
+    # Best of `repeats` cold imports; a missing dependency is reported instead of timed
+    best = None
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, "-c", _PROBE.format(package=PACKAGE, name=name)],
+                              cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            lines = proc.stderr.strip().splitlines()
+            return {'component': name, 'error': lines[-1] if lines else f"exit code {proc.returncode}"}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result['import_ms'] < best['import_ms']:
+            best = result
+    return dict(best, component=name)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark NVLib component import times")
+    parser.add_argument("components", nargs="*", default=COMPONENTS)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.components:
+        result = measure(name, args.repeats)
+        results.append(result)
+        if 'error' in result:
+            print(f"{name:22s} failed: {result['error']}")
+        else:
+            heavy = ", ".join(result['heavy']) or "none"
+            print(f"{name:22s} {result['import_ms']:8.1f} ms  {result['modules']:5d} modules  heavy: {heavy}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import json
+import random
+import time
+
+from ..Components.GUI.AutoGUI import NVLibParser
+
+# Times container parent resolution in NVLibParser on large generated layouts, without a window.
+# Run from the folder that contains NVLib:
+#   python -m NVLib.Benchmarks.LayoutBenchmark --sizes 1000 5000 20000 --output layout.json
+
+def generate_layout(components, nesting=3, seed=0):
+    # A grid of top-level Panels, each holding `nesting` levels of CardViews, filled with Buttons
+    rng = random.Random(seed)
+    containers_per_panel = nesting
+    panels = max(1, components // 20)
+    columns = max(1, int(panels ** 0.5))
+    rows = (panels + columns - 1) // columns
+    size = 400
+    width, height = columns * size, rows * size
+
+    data = []
+    for index in range(panels):
+        px, py = (index % columns) * size, (index // columns) * size
+        x, y, w, h = px, py, size, size
+        for level in range(containers_per_panel + 1):
+            data.append({'id': f"panel_{index}_{level}", 'type': 'Panel' if level == 0 else 'CardView',
+                         'x': x, 'y': y, 'width': w, 'height': h})
+            x, y, w, h = x + 20, y + 20, w - 40, h - 40
+    while len(data) < components:
+        px, py = rng.randrange(width - 10), rng.randrange(height - 10)
+        data.append({'id': f"button_{len(data)}", 'type': 'Button', 'x': px, 'y': py, 'width': 10, 'height': 10})
+    rng.shuffle(data)
+    return {'canvas': {'width': width, 'height': height}, 'components': data}
+
+def naive_resolve(components_data):
+    # The previous approach: scan every container for every component, first match wins
+    containers = [c for c in components_data if c.get('type') in ('CardView', 'Panel')]
+    parents = {}
+    for data in components_data:
+        if data.get('type') in ('CardView', 'Panel'):
+            continue
+        for c in containers:
+            if c['x'] <= data['x'] < c['x'] + c['width'] and c['y'] <= data['y'] < c['y'] + c['height']:
+                parents[data['id']] = c['id']
+                break
+    return parents
+
+def _best_of(function, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark NVLibParser container nesting")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--skip-naive-above", type=int, default=20000, help="Naive scan is quadratic")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        layout = generate_layout(size)
+        canvas, components = layout['canvas'], layout['components']
+        indexed = _best_of(lambda: NVLibParser.resolve_parents(components, canvas['width'], canvas['height']),
+                           args.repeats)
+        naive = _best_of(lambda: naive_resolve(components), args.repeats) if size <= args.skip_naive_above else None
+        results.append({'components': size, 'indexed_ms': indexed * 1000.0,
+                        'naive_ms': naive * 1000.0 if naive is not None else None})
+        naive_text = f"{naive * 1000.0:.1f} ms" if naive is not None else "skipped"
+        print(f"{size} components: spatial index {indexed * 1000.0:.1f} ms, naive scan {naive_text}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+    return results
+
+if __name__ == "__main__":
+    main()
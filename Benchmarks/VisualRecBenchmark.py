@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+import cv2
+
+from ..Components.VisualRec.FLRH import FaceHandDetector
+from ..Components.VisualRec.HandTracker import HandTracker
+from ..Components.VisualRec.LandmarkArray import array_to_landmarks
+
+# Replays video fixtures through FaceHandDetector and HandTracker with no camera and no GUI,
+# timing every stage of the real code paths. Run from the folder that contains NVLib:
+#   python -m NVLib.Benchmarks.VisualRecBenchmark --output results.json
+#   python -m NVLib.Benchmarks.VisualRecBenchmark --video clip.mp4 --compare results.json
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {}
+
+    def record(self, stage, seconds):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+        return timed
+
+class _TimedModel:
+    # Stands in for a MediaPipe solution so its process() calls are timed
+    def __init__(self, model, stage, timer):
+        self.model = model
+        self.process = timer.wrap(stage, model.process)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+def synthetic_frames(count=120, width=1280, height=720, seed=0):
+    # Deterministic fixture: a skin-toned blob moving over a noisy background
+    rng = np.random.default_rng(seed)
+    background = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+    for index in range(count):
+        frame = background.copy()
+        cx = int(width * (0.2 + 0.6 * (index % 60) / 60))
+        cy = int(height * 0.5)
+        cv2.ellipse(frame, (cx, cy), (90, 130), 0, 0, 360, (120, 160, 210), -1)
+        yield frame
+
+def video_frames(path, limit=None):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Could not open fixture: {path}")
+    count = 0
+    while limit is None or count < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        yield frame
+        count += 1
+    cap.release()
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB elsewhere
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)  # Windows
+    except (ImportError, AttributeError):
+        return None
+
+def _summary(samples):
+    values = np.asarray(samples) * 1000.0
+    return {
+        'count': len(values),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+    }
+
+def bench_face_hands(frames, timer, **config):
+    detector = FaceHandDetector(**config)
+    detector.face_mesh = _TimedModel(detector.face_mesh, 'face_inference', timer)
+    detector.hands = _TimedModel(detector.hands, 'hand_inference', timer)
+    detector.face_region.prepare = timer.wrap('color_conversion', detector.face_region.prepare)
+    detector.hand_region.prepare = timer.wrap('color_conversion', detector.hand_region.prepare)
+
+    for frame in frames:
+        start = time.perf_counter()
+        detector.detect_face(frame)
+        detector.detect_hands(frame)
+        timer.record('frame', time.perf_counter() - start)
+
+def bench_hands(frames, timer, **config):
+    tracker = HandTracker(headless_mode=True, **config)
+    tracker.mp_hands = _TimedModel(tracker.mp_hands, 'hand_inference', timer)
+    tracker.region_tracker.prepare = timer.wrap('color_conversion', tracker.region_tracker.prepare)
+
+    for frame in frames:
+        start = time.perf_counter()
+        points, _, _ = tracker.get_landmark_array(frame)
+        draw_start = time.perf_counter()
+        tracker.draw_landmarks(frame, array_to_landmarks(points))
+        for hand_points in points:
+            tracker.draw_hand_pointer(frame, hand_points)
+        end = time.perf_counter()
+        timer.record('drawing', end - draw_start)
+        timer.record('frame', end - start)
+
+SCENARIOS = {'face_hands': bench_face_hands, 'hands': bench_hands}
+
+def run(scenarios, frame_source, config):
+    results = {}
+    for name in scenarios:
+        timer = StageTimer()
+        wall_start = time.perf_counter()
+        SCENARIOS[name](frame_source(), timer, **config.get(name, {}))
+        wall = time.perf_counter() - wall_start
+        frames = len(timer.samples.get('frame', []))
+        results[name] = {
+            'frames': frames,
+            'fps': frames / wall if wall else 0.0,
+            'latency': _summary(timer.samples['frame']) if frames else None,
+            'stages': {stage: _summary(samples) for stage, samples in timer.samples.items() if stage != 'frame'},
+        }
+    return results
+
+def compare(current, baseline):
+    # Prints FPS and p95 changes against a previous results file
+    for name, result in current['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous or not result['latency'] or not previous['latency']:
+            continue
+        fps_change = (result['fps'] / previous['fps'] - 1) * 100 if previous['fps'] else 0.0
+        p95_change = (result['latency']['p95_ms'] / previous['latency']['p95_ms'] - 1) * 100
+        print(f"{name}: FPS {previous['fps']:.1f} -> {result['fps']:.1f} ({fps_change:+.1f}%), "
+              f"p95 {previous['latency']['p95_ms']:.1f} -> {result['latency']['p95_ms']:.1f} ms ({p95_change:+.1f}%)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark NVLib VisualRec without a camera or display")
+    parser.add_argument("--video", help="Recorded fixture to replay (default: synthetic frames)")
+    parser.add_argument("--frames", type=int, default=120, help="Frames to process")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append", help="Repeatable, default: all")
+    parser.add_argument("--inference-width", type=int, help="Downscale frames to this width before inference")
+    parser.add_argument("--roi", action="store_true", help="Enable ROI-cropped inference")
+    parser.add_argument("--adaptive", action="store_true", help="Enable HandTracker adaptive frame skipping")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    if args.video:
+        frame_source = lambda: video_frames(args.video, args.frames)
+    else:
+        frame_source = lambda: synthetic_frames(args.frames)
+
+    shared = {'inference_width': args.inference_width, 'roi': args.roi}
+    config = {'face_hands': dict(shared), 'hands': dict(shared, adaptive=args.adaptive)}
+    scenarios = args.scenario or sorted(SCENARIOS)
+
+    results = {
+        'fixture': args.video or f"synthetic:{args.frames}",
+        'config': vars(args),
+        'platform': {'python': platform.python_version(), 'machine': platform.machine(),
+                     'system': platform.system(), 'cpus': os.cpu_count()},
+        'scenarios': run(scenarios, frame_source, config),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    for name, result in results['scenarios'].items():
+        latency = result['latency'] or {}
+        print(f"{name}: {result['fps']:.1f} FPS, p50 {latency.get('p50_ms', 0):.1f} ms, p95 {latency.get('p95_ms', 0):.1f} ms")
+        for stage, summary in result['stages'].items():
+            print(f"    {stage}: mean {summary['mean_ms']:.2f} ms, p95 {summary['p95_ms']:.2f} ms")
+    if results['peak_rss_mb'] is not None:
+        print(f"Peak RSS: {results['peak_rss_mb']:.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,67 @@
 import os
 import sys
+import ast
+import json
+import time
 import shutil
+import hashlib
+import argparse
+import subprocess
 import contextlib
+import PyInstaller
 import PyInstaller.__main__
 
 OUTPUT_FOLDER = "Completed Build"
 TEMP_MAIN = "main_build.py"
+STATE_FILE = os.path.join(OUTPUT_FOLDER, ".build-state.json")
+WORK_FOLDER = os.path.join(OUTPUT_FOLDER, ".work")  # Kept between builds so PyInstaller can reuse its cache
+NVLIB_PACKAGE = "NVLib"
+NVLIB_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def create_main_copy(main_script):
+# Third-party packages each NVLib component needs at runtime (import names)
+COMPONENT_PACKAGES = {
+    'Audio': ['pygame', 'edge_tts'],
+    'Authentication': ['firebase_admin'],
+    'Database.Mariadb': ['mariadb'],
+    'Database.Tinydb': [],
+    'GUI': ['customtkinter', 'tkinter', 'PIL'],
+    'VisualRec': ['cv2', 'mediapipe', 'numpy'],
+}
+
+# Large packages from requirements.txt that are left out of the bundle unless the app needs them
+HEAVY_PACKAGES = [
+    'torch', 'torchaudio', 'tensorflow', 'tensorboard', 'keras', 'jax', 'jaxlib', 'scipy', 'sklearn',
+    'matplotlib', 'onnxruntime', 'ctranslate2', 'faster_whisper', 'tokenizers', 'huggingface_hub', 'h5py',
+    'sympy', 'networkx', 'selenium', 'flask', 'pyautogui', 'openwakeword', 'pvporcupine', 'languagemodels',
+    'speech_recognition', 'pyaudio', 'sounddevice', 'av', 'lxml', 'grpc', 'pyarrow',
+    'cv2', 'mediapipe', 'pygame', 'edge_tts', 'firebase_admin', 'mariadb', 'customtkinter', 'tkinter',
+    'PIL', 'numpy',
+]
+
+# What the heavy packages themselves import, so a needed package keeps its dependencies
+PACKAGE_DEPENDENCIES = {
+    'mediapipe': ['numpy', 'cv2', 'matplotlib'],
+    'matplotlib': ['numpy', 'PIL'],
+    'cv2': ['numpy'],
+    'customtkinter': ['tkinter'],
+    'firebase_admin': ['grpc'],
+    'torchaudio': ['torch'],
+    'torch': ['numpy', 'sympy', 'networkx'],
+    'tensorflow': ['numpy', 'keras', 'h5py', 'tensorboard', 'grpc'],
+    'keras': ['numpy', 'h5py'],
+    'jax': ['jaxlib', 'numpy', 'scipy'],
+    'jaxlib': ['numpy', 'scipy'],
+    'scipy': ['numpy'],
+    'sklearn': ['numpy', 'scipy'],
+    'faster_whisper': ['ctranslate2', 'tokenizers', 'onnxruntime', 'huggingface_hub', 'av', 'numpy'],
+    'onnxruntime': ['numpy', 'sympy'],
+    'openwakeword': ['onnxruntime', 'numpy', 'scipy'],
+    'pyautogui': ['PIL'],
+    'h5py': ['numpy'],
+    'pyarrow': ['numpy'],
+}
+
+def create_main_copy(main_script, probe_imports=""):
     with open(main_script, 'r', encoding='utf-8') as f:
         original_code = f.read()
 
@@ -23,6 +77,11 @@ def resource_path(path):
     return os.path.join(base_path, path)
 
 builtins.resource_path = resource_path
+
+if os.environ.get("NVLIB_STARTUP_PROBE"):
+    # Cold-start check run by build.py: load everything the app imports at startup, then exit
+    exec({probe_imports!r})
+    sys.exit(0)
 {original_code}
 """
 
@@ -31,8 +90,9 @@ builtins.resource_path = resource_path
 
 def collect_data_files():
     data_files = []
-    include_exts = (".json", ".ttf", ".jpg", ".jpeg", ".png")
-    exclude_folders = {"__pycache__", ".git", ".idea", "venv", "dist", "build", OUTPUT_FOLDER}
+    include_exts = (".json", ".nvlayout", ".ttf", ".jpg", ".jpeg", ".png")
+    exclude_folders = {"__pycache__", ".git", ".idea", "venv", ".venv", "dist", "build", OUTPUT_FOLDER,
+                       "Tutorial-Docs", "Benchmarks", "Build .exe"}
     exclude_files = {TEMP_MAIN, "build.py"}
 
     for root, dirs, files in os.walk("."):
@@ -43,47 +103,278 @@ def collect_data_files():
             if file.lower().endswith(include_exts):
                 full_path = os.path.join(root, file)
                 rel_path = os.path.dirname(full_path)
-                arg = f"{full_path}{os.pathsep}{rel_path}"
+                # Absolute source path, since the spec file is written to WORK_FOLDER
+                arg = f"{os.path.abspath(full_path)}{os.pathsep}{rel_path}"
                 data_files.append("--add-data")
                 data_files.append(arg)
     return data_files
 
+# --- Import Analysis ---
+
+def _lazy_component_names():
+    # name -> module for `from NVLib.Components import <name>`, read without importing NVLib
+    try:
+        with open(os.path.join(NVLIB_ROOT, "Components", "__init__.py"), 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError):
+        return {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == '_LAZY_NAMES' for t in node.targets):
+            names = ast.literal_eval(node.value)
+            return {name: f"{NVLIB_PACKAGE}.Components{module}" for name, (module, _) in names.items()}
+    return {}
+
+def _local_module_path(module, base_dir):
+    parts = module.split('.')
+    for candidate in (os.path.join(base_dir, *parts) + ".py", os.path.join(base_dir, *parts, "__init__.py")):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def analyze_imports(main_script):
+    # Follows the main script and the project's own modules it imports. Returns (NVLib component
+    # modules used, NVLib imports that match no component file, top-level third-party imports,
+    # source files analyzed).
+    base_dir = os.path.dirname(os.path.abspath(main_script))
+    lazy_names = _lazy_component_names()
+    components, packages, sources = set(), set(), []
+    pending, seen = [os.path.abspath(main_script)], set()
+
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        sources.append(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), path)
+        except (OSError, SyntaxError, UnicodeDecodeError) as e:
+            print(f"Warning: could not analyze '{path}': {e}")
+            continue
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules = [node.module]
+                if node.module == f"{NVLIB_PACKAGE}.Components":
+                    components.update(lazy_names.get(a.name, f"{node.module}.{a.name}") for a in node.names)
+                elif node.module.count('.') == 2 and node.module.startswith(f"{NVLIB_PACKAGE}.Components."):
+                    components.update(f"{node.module}.{a.name}" for a in node.names)  # Modules of a section
+            else:
+                continue
+
+            for module in modules:
+                if module.startswith(f"{NVLIB_PACKAGE}.Components."):
+                    if module.count('.') >= 3:
+                        components.add('.'.join(module.split('.')[:4]))  # NVLib.Components.<Section>.<Module>
+                    continue
+                if module.split('.')[0] == NVLIB_PACKAGE:
+                    continue
+                local = _local_module_path(module, base_dir)
+                if local:
+                    pending.append(os.path.abspath(local))
+                else:
+                    packages.add(module.split('.')[0])
+
+    unresolved = {m for m in components if not os.path.exists(_component_file(m))}
+    return sorted(components - unresolved), sorted(unresolved), sorted(packages), sources
+
+def _component_file(module):
+    return os.path.join(NVLIB_ROOT, *module.split('.')[1:]) + ".py"
+
+def required_packages(components, direct_packages):
+    needed = set(direct_packages)
+    for module in components:
+        parts = module.split('.')  # NVLib.Components.<Section>.<Module>
+        needed.update(COMPONENT_PACKAGES.get(f"{parts[2]}.{parts[3]}", COMPONENT_PACKAGES.get(parts[2], [])))
+    stack = list(needed)
+    while stack:
+        for dependency in PACKAGE_DEPENDENCIES.get(stack.pop(), []):
+            if dependency not in needed:
+                needed.add(dependency)
+                stack.append(dependency)
+    return needed
+
+def unknown_packages(direct_packages):
+    # Third-party imports whose dependencies are not in the tables above. Any of them could
+    # import a heavy package, so nothing can safely be excluded while one is present.
+    known = set(HEAVY_PACKAGES) | set(PACKAGE_DEPENDENCIES) | set(sys.stdlib_module_names)
+    return sorted(package for package in direct_packages if package not in known)
+
+def startup_imports(main_script):
+    # The module-level import statements of the main script, for the cold-start check
+    with open(main_script, 'r', encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return "\n".join(ast.get_source_segment(source, node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)) and getattr(node, 'module', None) != '__future__')
+
+# --- Incremental Builds ---
+
+def hash_inputs(sources, data_files, options):
+    # Everything that affects the executable: code, bundled data, build options, PyInstaller version
+    digest = hashlib.sha256(json.dumps([options, PyInstaller.__version__, sys.version], sort_keys=True).encode())
+    data_paths = data_files[1::2]  # "--add-data", "src<sep>dest" pairs
+    for path in sorted(sources) + sorted(arg.split(os.pathsep)[0] for arg in data_paths):
+        digest.update(path.encode('utf-8'))
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def load_state():
+    try:
+        with open(STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_state(state):
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=4)
+
+def artifact_path(exe_name, onedir):
+    executable = exe_name + (".exe" if os.name == "nt" else "")
+    if onedir:
+        return os.path.join(OUTPUT_FOLDER, exe_name, executable)
+    return os.path.join(OUTPUT_FOLDER, executable)
+
+def remove_artifact(exe_name, onedir):
+    path = os.path.join(OUTPUT_FOLDER, exe_name) if onedir else artifact_path(exe_name, onedir)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.isfile(path):
+        os.remove(path)
+
+def bundle_size(exe_name, onedir):
+    if not onedir:
+        return os.path.getsize(artifact_path(exe_name, onedir))
+    total = 0
+    for root, _, files in os.walk(os.path.join(OUTPUT_FOLDER, exe_name)):
+        total += sum(os.path.getsize(os.path.join(root, file)) for file in files)
+    return total
+
+def measure_cold_start(path, timeout=120):
+    # Launches the executable in probe mode: it unpacks, imports what the app imports, and exits
+    env = dict(os.environ, NVLIB_STARTUP_PROBE="1")
+    start = time.perf_counter()
+    try:
+        result = subprocess.run([path], env=env, timeout=timeout, capture_output=True)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"Warning: cold-start check failed: {e}")
+        return None
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        print(f"Warning: cold-start check exited with code {result.returncode}")
+        return None
+    return elapsed
+
+def report(entry):
+    size_mb = entry['size_bytes'] / (1024 * 1024)
+    cold_start = f"{entry['cold_start_s']:.2f} s" if entry.get('cold_start_s') is not None else "not measured"
+    print(f"Bundle size: {size_mb:.1f} MB, cold start: {cold_start}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build an executable from an NVLib project")
+    parser.add_argument("main_script", nargs="?", help="Main Python script, e.g. main.py")
+    parser.add_argument("--name", help="Project (executable) name")
+    parser.add_argument("--onedir", action="store_true",
+                        help="Build a folder instead of a single file; starts faster since nothing is unpacked")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if no input changed")
+    parser.add_argument("--keep", nargs="*", default=[], help="Heavy packages to bundle even if unused")
+    parser.add_argument("--verbose", action="store_true", help="Show PyInstaller output instead of logging it")
+    parser.add_argument("--no-startup-check", action="store_true", help="Skip measuring cold-start time")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    while True:
+    args = parse_args()
+    exe_name = args.name
+    main_script = args.main_script
+    while not exe_name:
         exe_name = input("Enter Project Name: ")
+    while not (main_script and os.path.exists(main_script) and main_script.endswith(".py")):
+        if main_script:
+            print(f"File '{main_script}' not found or invalid. Try again.")
         main_script = input("Enter your main Python script (e.g., main.py): ")
-        if os.path.exists(main_script) and main_script.endswith(".py"):
-            break
-        print(f"File '{main_script}' not found or invalid. Try again.")
 
     os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
-    print("[1/3] Creating temporary main_build.py...")
-    create_main_copy(main_script)
+    print("[1/4] Analyzing imports...")
+    components, unresolved, direct_packages, sources = analyze_imports(main_script)
+    needed = required_packages(components, direct_packages) | set(args.keep)
+    unknown = unknown_packages(direct_packages)
+    excluded = [] if unknown or unresolved else [package for package in HEAVY_PACKAGES if package not in needed]
+    print(f"      NVLib components: {', '.join(m.split('.', 2)[2] for m in components) or 'none'}")
+    if unresolved:
+        print(f"      Warning: {', '.join(unresolved)} not found under '{NVLIB_ROOT}'; keeping every package")
+    if unknown:
+        print(f"      Dependencies of {', '.join(unknown)} are unknown (see PACKAGE_DEPENDENCIES); keeping every package")
+    print(f"      Excluding unused packages: {', '.join(excluded) or 'none'}")
+    # Components import their section's other modules, so all of those count as inputs
+    section_dirs = {os.path.dirname(_component_file(m)) for m in components}
+    sources += sorted(os.path.join(d, f) for d in section_dirs for f in os.listdir(d) if f.endswith(".py"))
 
-    print("[2/3] Collecting project files...")
+    print("[2/4] Collecting project files...")
     data_files = collect_data_files()
 
-    print("[3/3] Building executable...")
+    options = {'name': exe_name, 'onedir': args.onedir, 'excluded': excluded, 'components': components}
+    input_hash = hash_inputs(sources, data_files, options)
+    state = load_state()
+    previous = state.get(exe_name)
+    if not args.force and previous and previous.get('hash') == input_hash and os.path.exists(artifact_path(exe_name, args.onedir)):
+        print("Nothing changed since the last build; skipping. Use --force to rebuild.")
+        report(previous)
+        sys.exit(0)
+
+    print("[3/4] Building executable...")
+    remove_artifact(exe_name, not args.onedir)  # Output of the other mode would clash or go stale
+    create_main_copy(main_script, startup_imports(main_script))
     pyinstaller_args = [
         TEMP_MAIN,
-        "--onefile",
+        "--onedir" if args.onedir else "--onefile",
         "--windowed",
         "--name", exe_name,
         "--distpath", OUTPUT_FOLDER,
+        "--workpath", WORK_FOLDER,
+        "--specpath", WORK_FOLDER,
         "--noconfirm"
     ] + data_files
+    for module in components:
+        pyinstaller_args += ["--hidden-import", module]  # Components imported by name load through importlib
+    for package in excluded:
+        pyinstaller_args += ["--exclude-module", package]
 
-    with open(os.devnull, "w") as devnull:
-        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+    log_path = os.path.join(OUTPUT_FOLDER, f"{exe_name}-build.log")
+    succeeded = False
+    try:
+        if args.verbose:
             PyInstaller.__main__.run(pyinstaller_args)
+        else:
+            with open(log_path, "w") as log:
+                with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                    PyInstaller.__main__.run(pyinstaller_args)
+        succeeded = True
+    except (Exception, SystemExit) as e:
+        print(f"Build failed: {e}" + ("" if args.verbose else f" (see '{log_path}')"))
+    finally:
+        if os.path.exists(TEMP_MAIN):
+            os.remove(TEMP_MAIN)
+    if not succeeded:
+        sys.exit(1)
 
-    if os.path.exists(TEMP_MAIN):
-        os.remove(TEMP_MAIN)
-    if os.path.exists("build"):
-        shutil.rmtree("build")
-    spec_file = f"{exe_name}.spec"
-    if os.path.exists(spec_file):
-        os.remove(spec_file)
+    print("[4/4] Measuring bundle...")
+    path = artifact_path(exe_name, args.onedir)
+    entry = {
+        'hash': input_hash,
+        'mode': 'onedir' if args.onedir else 'onefile',
+        'size_bytes': bundle_size(exe_name, args.onedir),
+        'cold_start_s': None if args.no_startup_check else measure_cold_start(path),
+        'built_at': time.time(),
+    }
+    state[exe_name] = entry
+    save_state(state)
 
-    print(f"Build complete! Executable is in '{OUTPUT_FOLDER}/{exe_name}.exe'")
+    print(f"Build complete! Executable is in '{path}'")
+    report(entry)
@@ -1,41 +1,385 @@
-import pygame  # For handling audio playback
 import asyncio  # For asynchronous operations
-import edge_tts  # For text-to-speech functionality
 import os  # For file handling
+import io  # For in-memory audio buffers
+import hashlib  # For content-addressed cache keys
+import threading  # For guarding the cache index
+import uuid  # For unique temporary file names
+import queue  # For the playback queue
+import itertools  # For queue ordering within a priority
+import re  # For splitting long texts into sentences
+from collections import deque  # For the synthesis look-ahead window
+from collections import OrderedDict  # For LRU ordering
 
-# Asynchronous function to convert text to an audio file
-async def _text_to_audio_file(text) -> None:
-    # Define the path for speech file inside NVLib/TTS-Data folder
-    nvlib_folder = "NVLib"
-    ttse_folder = os.path.join(nvlib_folder, "TTS-Data")
-    
-    # Ensure the directory exists
-    os.makedirs(ttse_folder, exist_ok=True)
-    
-    file_path = os.path.join(ttse_folder, "speech.mp3")  # Define speech file path
-
-    if os.path.exists(file_path):  # Remove existing file to avoid conflicts
-        os.remove(file_path)
-
-    communicate = edge_tts.Communicate(text, "en-CA-LiamNeural", pitch="+5Hz", rate="+13%")
-    await communicate.save(file_path)  # Save speech as an MP3 file
-
-# Function to play the generated speech file
-def _play_audio():
-    pygame.mixer.init()
-    pygame.mixer.music.load("NVLib/TTS-Data/speech.mp3")
-    pygame.mixer.music.play()
-    
-    while pygame.mixer.music.get_busy():
-        pygame.time.Clock().tick(10)
-
-    pygame.mixer.music.stop()
-    pygame.mixer.quit()
-
-# Function to handle text-to-speech conversion
-def say(text):
+DEFAULT_VOICE = "en-CA-LiamNeural"
+DEFAULT_PITCH = "+5Hz"
+DEFAULT_RATE = "+13%"
+
+# Folder for TTS data such as the speech cache. Set with set_data_dir() or NVLIB_TTS_DIR.
+_data_dir = os.environ.get("NVLIB_TTS_DIR") or os.path.join("NVLib", "TTS-Data")
+
+# Disk cache of synthesized speech, keyed on (text, voice, pitch, rate)
+class SpeechCache:
+    def __init__(self, folder, max_bytes=200 * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._index = OrderedDict()  # key -> file size, least recently used first
+        self._size = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        # Rebuild the in-memory index from the files on disk, oldest access first
+        os.makedirs(self.folder, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.folder):
+            if name.endswith(".mp3"):
+                stat = os.stat(os.path.join(self.folder, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+
+    @staticmethod
+    def key(text, voice, pitch, rate):
+        return hashlib.sha256("\0".join((text, voice, pitch, rate)).encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.folder, f"{key}.mp3")
+
+    def read(self, key):
+        # Returns the cached audio bytes, or None on a miss. Audio is read into memory so
+        # another thread or process evicting the file cannot break playback.
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Keeps the LRU order across restarts
+            return data
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._index.pop(key, 0)
+            return None
+
+    def write(self, key, data):
+        # Stores audio through a unique temp file and an atomic rename, so concurrent writers
+        # in any thread or process never see or clobber a half-written file
+        temp_path = os.path.join(self.folder, f"tmp-{uuid.uuid4().hex}.part")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        with self._lock:
+            self._size += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            if self._size <= self.max_bytes:
+                return
+            # Other processes share the folder, so recount from disk before evicting
+            self._index.clear()
+            self._size = 0
+            self._load()  # The file just written has the newest mtime, so it is evicted last
+            evicted = []
+            while self._size > self.max_bytes and len(self._index) > 1:
+                old_key, old_size = self._index.popitem(last=False)
+                self._size -= old_size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self.path(old_key))
+            except OSError:
+                pass
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# Function to move TTS data (the speech cache) to another folder
+def set_data_dir(path):
+    global _data_dir, _cache
+    with _cache_lock:
+        _data_dir = path
+        _cache = None
+
+# Function to get the shared speech cache, created on first use
+def _speech_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SpeechCache(os.path.join(_data_dir, "cache"))
+        return _cache
+
+# Default synthesizer: yields MP3 audio chunks from edge_tts as they arrive.
+# Any async generator with the same signature can replace it (e.g. a local fake in tests).
+async def _edge_tts_stream(text, voice, pitch, rate):
+    import edge_tts  # For text-to-speech functionality; imported on first synthesis
+    communicate = edge_tts.Communicate(text, voice, pitch=pitch, rate=rate)
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            yield chunk["data"]
+
+# Function to check whether audio may go through the shared disk cache. Cache keys only
+# describe edge_tts output, so audio from any other synthesizer is never read from or written to it.
+def _cacheable(synthesizer, use_cache):
+    return use_cache and synthesizer in (None, _edge_tts_stream)
+
+# Asynchronous function to get the MP3 bytes for text, synthesizing only on a cache miss.
+# Synthesis happens in memory, so any number of threads or processes can run it at once.
+async def _text_to_audio(text, voice=DEFAULT_VOICE, pitch=DEFAULT_PITCH, rate=DEFAULT_RATE,
+                         synthesizer=None, use_cache=True):
+    cache = _speech_cache() if _cacheable(synthesizer, use_cache) else None
+    key = SpeechCache.key(text, voice, pitch, rate)
+    if cache:
+        cached = cache.read(key)
+        if cached:
+            return cached  # Cache hit: no network or synthesis
+
+    buffer = bytearray()
+    async for data in (synthesizer or _edge_tts_stream)(text, voice, pitch, rate):
+        buffer += data  # Collect audio chunks as they arrive
+    audio = bytes(buffer)
+    if cache and audio:
+        cache.write(key, audio)
+    return audio
+
+# Function to split text into sentence segments. The first segment is kept short so the
+# first audio is ready quickly; the rest are synthesized while earlier ones play.
+def split_sentences(text, first_segment_chars=60):
+    segments = [part.strip() for part in re.split(r"(?<=[.!?;:])\s+", text.strip()) if part.strip()]
+    if segments and len(segments[0]) > first_segment_chars:
+        head = segments[0]
+        cut = head.rfind(",", 0, first_segment_chars)
+        if cut <= 0:
+            cut = head.rfind(" ", 0, first_segment_chars)
+        if cut > 0:
+            segments[0:1] = [head[:cut + 1].strip(), head[cut + 1:].strip()]
+    return segments
+
+# Asynchronous generator of MP3 bytes for text, in order. A whole-text cache hit is used
+# directly; otherwise each segment is synthesized up to `lookahead` segments ahead of playback.
+async def stream_audio(text, voice=DEFAULT_VOICE, pitch=DEFAULT_PITCH, rate=DEFAULT_RATE,
+                       synthesizer=None, lookahead=2, use_cache=True):
+    cached = _cacheable(synthesizer, use_cache) and _speech_cache().read(SpeechCache.key(text, voice, pitch, rate))
+    if cached:
+        yield cached
+        return
+    segments = split_sentences(text)
+
+    pending = deque()
+    remaining = iter(segments)
+    try:
+        for segment in itertools.islice(remaining, lookahead):
+            pending.append(asyncio.ensure_future(_text_to_audio(segment, voice, pitch, rate, synthesizer, use_cache)))
+        while pending:
+            audio = await pending.popleft()
+            for segment in itertools.islice(remaining, 1):
+                pending.append(asyncio.ensure_future(_text_to_audio(segment, voice, pitch, rate, synthesizer, use_cache)))
+            yield audio
+    finally:
+        for task in pending:
+            task.cancel()
+
+# pygame.mixer.music is one player per process, so Speakers take turns: each utterance holds it
+# until it has finished or been interrupted
+_player_lock = threading.Lock()
+
+# Long-lived speech player: one worker thread per Speaker, fed by a priority queue
+class Speaker:
+    def __init__(self, voice=DEFAULT_VOICE, pitch=DEFAULT_PITCH, rate=DEFAULT_RATE, stream=True, synthesizer=None,
+                 use_cache=True):
+        self.voice = voice
+        self.pitch = pitch
+        self.rate = rate
+        self.stream = stream  # Play sentence by sentence while later sentences synthesize
+        self.synthesizer = synthesizer
+        self.use_cache = use_cache  # False keeps all audio in memory, nothing touches disk
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()  # Keeps first-in-first-out order within a priority
+        self._generation = 0  # Bumped by every interrupt
+        self._current = 0     # Generation the playing item started in; it stops once they differ
+        self._idle = threading.Condition()
+        self._unfinished = 0
+        self._thread = None
+        self._lock = threading.Lock()  # Guards the queue and generations together
+        self._ready = threading.Condition(self._lock)
+        self._error = None  # Set when audio could not be started; nothing is spoken after that
+
+    def say_async(self, text, priority=0, interrupt=False, voice=None, pitch=None, rate=None, stream=None):
+        # Queues text and returns immediately with an Event that is set once it has been spoken.
+        # Higher priority is spoken first; interrupt=True cuts off whatever is playing now.
+        self._start()
+        done = threading.Event()
+        stream = self.stream if stream is None else stream
+        item = (text, voice or self.voice, pitch or self.pitch, rate or self.rate, stream, done)
+        with self._idle:
+            self._unfinished += 1
+        with self._lock:
+            # Queued and interrupted under the lock the worker dequeues with, so the new item
+            # always starts after the interrupt instead of cutting itself off
+            if self._error is None:
+                self._queue.put((-priority, next(self._order), item))
+                if interrupt:
+                    self._generation += 1
+                self._ready.notify()
+                return done
+        self._reject(item)
+        return done
+
+    def say(self, text, priority=0, voice=None, pitch=None, rate=None, stream=None):
+        # Speaks text and blocks until it has been played
+        self.say_async(text, priority, False, voice, pitch, rate, stream).wait()
+
+    def interrupt(self, clear_queue=True):
+        # Stops the current utterance, and by default drops everything still queued
+        with self._lock:
+            if clear_queue:
+                self._drain()
+            self._generation += 1
+
+    def wait(self, timeout=None):
+        # Blocks until everything queued so far has been spoken; returns False on timeout
+        with self._idle:
+            return self._idle.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _interrupted(self):
+        return self._generation != self._current
+
+    def _drain(self, finish=None):
+        # Marks every queued item done without speaking it; call with _lock held
+        while True:
+            try:
+                _, _, item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            (finish or self._finish)(item)
+
+    def _reject(self, item):
+        # Like the original say(), reports why audio failed instead of raising
+        print(f"Error in say function: {self._error}")
+        self._finish(item)
+
+    def _finish(self, item):
+        item[-1].set()
+        with self._idle:
+            self._unfinished -= 1
+            self._idle.notify_all()
+
+    def _run(self):
+        try:
+            import pygame  # For handling audio playback; imported by the worker, not at startup
+            pygame.mixer.init()  # Paid once for the life of the worker
+        except Exception as e:
+            # No audio device or no pygame: report it and release everyone waiting on speech
+            with self._lock:
+                self._error = e
+                self._drain(self._reject)
+            return
+        loop = asyncio.new_event_loop()
+        while True:
+            with self._ready:
+                # Dequeued and tagged in one step, so an interrupt either drops the item while it
+                # is still queued or cuts it off once it is playing
+                self._ready.wait_for(lambda: not self._queue.empty())
+                _, _, item = self._queue.get_nowait()
+                self._current = self._generation
+            try:
+                loop.run_until_complete(self._speak(*item[:-1]))
+            except Exception as e:
+                print(f"Error in say function: {e}")
+            finally:
+                self._finish(item)
+
+    async def _speak(self, text, voice, pitch, rate, stream):
+        owns_player = False
+        try:
+            if stream:
+                segments = stream_audio(text, voice, pitch, rate, self.synthesizer, use_cache=self.use_cache)
+                try:
+                    async for audio in segments:
+                        owns_player = owns_player or await self._acquire_player()
+                        if not owns_player or self._interrupted():
+                            break
+                        await self._play(audio)
+                finally:
+                    await segments.aclose()
+            else:
+                audio = await _text_to_audio(text, voice, pitch, rate, self.synthesizer, self.use_cache)
+                owns_player = await self._acquire_player()
+                if owns_player and not self._interrupted():
+                    await self._play(audio)
+        finally:
+            if owns_player:
+                _player_lock.release()
+
+    async def _acquire_player(self):
+        # Waits for another Speaker's utterance to finish without blocking synthesis; False if
+        # this one is interrupted meanwhile
+        while not _player_lock.acquire(blocking=False):
+            if self._interrupted():
+                return False
+            await asyncio.sleep(0.02)
+        return True
+
+    async def _play(self, audio):
+        # Plays MP3 bytes from memory. Polls without blocking the loop, so the next segments
+        # keep synthesizing meanwhile.
+        import pygame
+        pygame.mixer.music.load(io.BytesIO(audio), "mp3")
+        pygame.mixer.music.play()
+        while pygame.mixer.music.get_busy():
+            if self._interrupted():
+                break
+            await asyncio.sleep(0.02)
+        pygame.mixer.music.stop()
+        pygame.mixer.music.unload()
+
+_default_speaker = None
+_default_speaker_lock = threading.Lock()
+
+# Function to get the process-wide Speaker used by say() and say_async()
+def _speaker():
+    global _default_speaker
+    with _default_speaker_lock:
+        if _default_speaker is None:
+            _default_speaker = Speaker()
+        return _default_speaker
+
+# Function to handle text-to-speech conversion, blocking until the speech has played
+def say(text, voice=DEFAULT_VOICE, pitch=DEFAULT_PITCH, rate=DEFAULT_RATE, stream=True):
     try:
-        asyncio.run(_text_to_audio_file(text))  # Convert text to speech file
-        _play_audio()  # Play the generated speech file
+        _speaker().say(text, voice=voice, pitch=pitch, rate=rate, stream=stream)
     except Exception as e:
         print(f"Error in say function: {e}")
+
+# Function to queue speech without waiting for it; returns an Event set once it has played
+def say_async(text, priority=0, interrupt=False, voice=DEFAULT_VOICE, pitch=DEFAULT_PITCH, rate=DEFAULT_RATE, stream=True):
+    return _speaker().say_async(text, priority, interrupt, voice, pitch, rate, stream)
+
+# Function to synthesize phrases into the cache ahead of time, a few at once
+def prewarm(phrases, voice=DEFAULT_VOICE, pitch=DEFAULT_PITCH, rate=DEFAULT_RATE, concurrency=4):
+    async def _prewarm():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def synthesize(phrase):
+            async with semaphore:
+                try:
+                    await _text_to_audio(phrase, voice, pitch, rate)
+                    return True
+                except Exception as e:
+                    print(f"Error prewarming '{phrase}': {e}")
+                    return False
+
+        return await asyncio.gather(*(synthesize(phrase) for phrase in dict.fromkeys(phrases)))
+
+    return sum(asyncio.run(_prewarm()))  # Number of phrases now available in the cache
@@ -1,11 +1,12 @@
 import os
 import sys
-import firebase_admin
-from firebase_admin import credentials, auth
 
 class Auth:
     def __init__(self, service_account_key):
         try:
+            import firebase_admin  # Loaded on first use; it is slow to import
+            from firebase_admin import credentials, auth
+
             if getattr(sys, 'frozen', False):
                 base_path = sys._MEIPASS
             else:
@@ -8,6 +8,13 @@ import os
 import sys
 import atexit
 import tempfile
+import hashlib
+import zlib
+import threading
+import time
+import contextlib
+from collections import deque, OrderedDict
+from PIL import ImageChops
 
 def resource_path(relative_path):
     try:
@@ -18,6 +25,64 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+# --- Shared Font Cache ---
+
+_font_cache = {}
+
+def get_font(family, size, weight):
+    # One CTkFont per (family, size, weight), shared by every widget that uses it
+    key = (family, size, weight)
+    font = _font_cache.get(key)
+    if font is None:
+        font = ctk.CTkFont(family=family, size=size, weight=weight)
+        _font_cache[key] = font
+    return font
+
+def clear_font_cache():
+    # Fonts belong to a Tk root, so a new root needs fresh ones
+    _font_cache.clear()
+
+# --- Build and Render Profiling ---
+
+class GUIProfiler:
+    # Records timed spans (category, name) while profiling is on; see AutoGUI.enable_debugging
+    def __init__(self, max_events=100000):
+        self.events = deque(maxlen=max_events)  # (category, name, start, duration, thread id)
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, category, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((category, name, start, time.perf_counter() - start, threading.get_ident()))
+
+    def report(self):
+        # {category: {name: {'count', 'total_ms', 'mean_ms', 'max_ms'}}}
+        report = {}
+        for category, name, _, duration, _ in self.events:
+            stats = report.setdefault(category, {}).setdefault(name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['count'] += 1
+            stats['total_ms'] += duration * 1000.0
+            stats['max_ms'] = max(stats['max_ms'], duration * 1000.0)
+        for names in report.values():
+            for stats in names.values():
+                stats['mean_ms'] = stats['total_ms'] / stats['count']
+        return report
+
+    def save_trace(self, path):
+        # Chrome trace event format: open in chrome://tracing or ui.perfetto.dev
+        pid = os.getpid()
+        events = [{'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': (start - self._origin) * 1e6, 'dur': duration * 1e6}
+                  for category, name, start, duration, tid in self.events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+def _span(profiler, category, name):
+    return profiler.span(category, name) if profiler else contextlib.nullcontext()
+
 # --- Component Wrapper Classes for the Simplified API ---
 
 class BaseWrapper:
@@ -26,19 +91,25 @@ class BaseWrapper:
         self.layout_info = layout_info
         self.font_info = font_info
         self.is_visible = True
+        self._font_key = None  # (size, weight) last applied by _rescale_font
 
-    def _rescale_font(self, scale_factor):
+    def _scaled_font(self, scale_factor):
+        # Returns the shared font for this scale, or None when nothing would change
         if not self.font_info:
-            return
-        
+            return None
         new_size = int(self.font_info['size'] * scale_factor)
         if new_size < 1: new_size = 1
-        
+        font_key = (new_size, self.font_info['weight'])
+        if font_key == self._font_key:
+            return None
+        self._font_key = font_key
+        return get_font(self.font_info['family'], new_size, self.font_info['weight'])
+
+    def _rescale_font(self, scale_factor):
         try:
-            new_font = ctk.CTkFont(family=self.font_info['family'], 
-                                   size=new_size, 
-                                   weight=self.font_info['weight'])
-            self.widget.configure(font=new_font)
+            new_font = self._scaled_font(scale_factor)
+            if new_font:
+                self.widget.configure(font=new_font)
         except Exception as e:
             # This can happen if the font isn't found, especially during rapid resizing.
             pass
@@ -76,6 +147,7 @@ class BaseWrapper:
         else:
             new_weight = "bold" if is_bold else "normal"
             self.font_info['weight'] = new_weight
+            self._font_key = None
             self.widget.configure(font=(current_font.cget("family"), current_font.cget("size"), new_weight))
 
 
@@ -156,13 +228,10 @@ class ProgressWrapper(BaseWrapper):
     def _rescale_font(self, scale_factor):
         # Also scale the label inside the progress bar
         if self.label and self.font_info:
-            new_size = int(self.font_info['size'] * scale_factor)
-            if new_size < 1: new_size = 1
             try:
-                new_font = ctk.CTkFont(family=self.font_info['family'], 
-                                    size=new_size, 
-                                    weight=self.font_info['weight'])
-                self.label.configure(font=new_font)
+                new_font = self._scaled_font(scale_factor)
+                if new_font:
+                    self.label.configure(font=new_font)
             except: pass
 
 class SelectWrapper(BaseWrapper):
@@ -191,11 +260,9 @@ class RadioGroupWrapper(BaseWrapper):
     
     def _rescale_font(self, scale_factor):
         # Scale the main label and all the radio button labels
-        if not self.font_info: return
-        new_size = int(self.font_info['size'] * scale_factor)
-        if new_size < 1: new_size = 1
         try:
-            new_font = ctk.CTkFont(family=self.font_info['family'], size=new_size, weight=self.font_info['weight'])
+            new_font = self._scaled_font(scale_factor)
+            if not new_font: return
             if self.label:
                 self.label.configure(font=new_font)
             for radio in self.radios:
@@ -225,25 +292,248 @@ class SpinnerWrapper(BaseWrapper):
         # Override to do nothing, preventing spinner font from scaling
         pass
 
+# Wrapper class per component type, for telling methods from attributes before a widget exists
+WRAPPER_CLASSES = {
+    'Button': ButtonWrapper, 'TextBox': ValueWrapper, 'TextArea': ValueWrapper, 'Checkbox': CheckWrapper,
+    'RadioGroup': RadioGroupWrapper, 'ToggleButton': ToggleWrapper, 'Dropdown': SelectWrapper,
+    'Slider': SliderWrapper, 'ProgressBar': ProgressWrapper, 'Spinner': SpinnerWrapper,
+}
+
+class LazyWrapper:
+    # Stands in for a component that has not been created yet (see NVLibParser.materialize).
+    # Method calls with arguments, like text("Hi") or on_click(cb), are recorded and replayed
+    # once the widget exists. Anything else, including toggle_visibility() and getters, creates
+    # the widget first and then forwards to the real wrapper.
+    def __init__(self, gui, name, comp_type):
+        self._gui = gui
+        self._name = name
+        self._class = WRAPPER_CLASSES.get(comp_type, BaseWrapper)
+        self._calls = []
+        self._wrapper = None
+
+    def _resolve(self, wrapper):
+        self._wrapper = wrapper
+        for attr, args, kwargs in self._calls:
+            getattr(wrapper, attr)(*args, **kwargs)
+        self._calls = []
+
+    def _real(self):
+        if self._wrapper is None:
+            self._gui._materialize(self._name)
+        return self._wrapper
+
+    def __getattr__(self, attr):
+        if self._wrapper is not None or not callable(getattr(self._class, attr, None)):
+            return getattr(self._real(), attr)
+
+        def call(*args, **kwargs):
+            if self._wrapper is None and (args or kwargs):
+                self._calls.append((attr, args, kwargs))
+                return None
+            return getattr(self._real(), attr)(*args, **kwargs)
+        return call
+
+# --- Decoded Image Cache ---
+
+class ImageCache:
+    # Decoded, display-sized images keyed by a hash of their source data. Kept in memory across
+    # rebuilds and optionally persisted as PNG files so later startups skip decoding entirely.
+    # Least recently used images are dropped once the cache holds more than max_bytes of pixels
+    # (None for no limit); widgets keep their own reference, so only later rebuilds decode again.
+    def __init__(self, folder=None, max_bytes=256 * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.images = OrderedDict()
+        self._bytes = 0
+
+    def set_folder(self, folder):
+        self.folder = folder
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    @staticmethod
+    def digest(src):
+        return hashlib.sha1(src.encode("ascii", "ignore")).hexdigest()
+
+    @staticmethod
+    def key(digest, size, radius=0, opacity=1.0):
+        return f"{digest}-{size[0]}x{size[1]}-r{radius}-o{opacity}"
+
+    def get(self, src, size, radius=0, opacity=1.0, digest=None):
+        # Returns an RGBA image no larger than size (width, height). Compiled layouts carry no
+        # source data, only its digest, so their images must already be preloaded or on disk.
+        key = self.key(digest or self.digest(src), size, radius, opacity)
+        img = self.images.get(key)
+        if img is not None:
+            self.images.move_to_end(key)
+            return img
+
+        disk_path = os.path.join(self.folder, f"{key}.png") if self.folder else None
+        if disk_path and os.path.exists(disk_path):
+            img = Image.open(disk_path)
+            img.load()
+        elif not src:
+            raise KeyError(f"Image '{key}' has no source data")
+        else:
+            img = self._decode(src, size)
+            img = NVLibParser._process_image(img, radius, opacity)
+            if disk_path:
+                img.save(disk_path, format="PNG")
+        self._store(key, img)
+        return img
+
+    def _store(self, key, img):
+        old = self.images.pop(key, None)
+        if old is not None:
+            self._bytes -= old.width * old.height * 4
+        self.images[key] = img
+        self._bytes += img.width * img.height * 4
+        while self.max_bytes is not None and self._bytes > self.max_bytes and len(self.images) > 1:
+            _, evicted = self.images.popitem(last=False)
+            self._bytes -= evicted.width * evicted.height * 4
+
+    @staticmethod
+    def _decode(src, size):
+        img = Image.open(io.BytesIO(base64.b64decode(src)))
+        target = (max(1, int(size[0])), max(1, int(size[1])))
+        img.draft("RGB", target)  # JPEG decodes straight at a reduced scale; no-op for other formats
+        img = img.convert("RGBA")
+        if img.width > target[0] or img.height > target[1]:
+            # Only ever shrink: the widget never shows more pixels than its display size
+            img = img.resize((min(img.width, target[0]), min(img.height, target[1])),
+                             Image.Resampling.LANCZOS, reducing_gap=3.0)
+        return img
+
+    def preload(self, entries):
+        # Adds images decoded ahead of time by the layout compiler (see LayoutCompiler.py)
+        for key, entry in entries.items():
+            if key not in self.images:
+                raw = zlib.decompress(base64.b64decode(entry['data']))
+                self._store(key, Image.frombytes("RGBA", tuple(entry['size']), raw))
+
+    def clear(self):
+        self.images.clear()
+        self._bytes = 0
+
+_image_cache = ImageCache()
+
+def _display_scaling(widget):
+    # CustomTkinter's DPI scaling for the window, so images stay sharp on HiDPI displays
+    try:
+        return ctk.ScalingTracker.get_window_scaling(widget.winfo_toplevel())
+    except Exception:
+        return 1.0
+
+# --- Compiled Layouts ---
+
+# Bump whenever the compiled layout format changes, so stale files are ignored
+COMPILED_LAYOUT_VERSION = 2
+
+def compiled_layout_path(file_path):
+    return os.path.splitext(file_path)[0] + ".nvlayout"
+
+def source_hash(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_compiled_layout(file_path):
+    # Returns the compiled form of a layout JSON file, or None when there is none or it was
+    # compiled from a different version of the file. The first line is a small header, so a
+    # stale file is rejected without parsing the rest.
+    compiled_path = compiled_layout_path(file_path)
+    if not (os.path.exists(compiled_path) and os.path.exists(file_path)):
+        return None
+    try:
+        with open(compiled_path, 'r') as f:
+            header = json.loads(f.readline())
+            if header.get('version') != COMPILED_LAYOUT_VERSION or header.get('source_sha256') != source_hash(file_path):
+                return None
+            return json.loads(f.readline())
+    except (OSError, ValueError) as e:
+        print(f"Error loading compiled layout: {e}")
+        return None
+
+# --- Container Spatial Index ---
+
+CONTAINER_TYPES = ('CardView', 'Panel')
+
+class ContainerIndex:
+    # Uniform grid over container rectangles. A point lookup only checks the containers
+    # registered in its grid cell, instead of every container in the layout.
+    def __init__(self, containers, canvas_width, canvas_height):
+        self.containers = containers
+        count = max(1, len(containers))
+        self.cell = max(16, int(((canvas_width * canvas_height) / count) ** 0.5))
+        self.cells = {}
+        self.rank = {}  # id(container) -> (area, document order); smaller ranks are inner
+        for order, c in enumerate(containers):
+            x, y, w, h = c.get('x'), c.get('y'), c.get('width'), c.get('height')
+            self.rank[id(c)] = (w * h, order)
+            for cx in range(int(x // self.cell), int((x + w - 1) // self.cell) + 1):
+                for cy in range(int(y // self.cell), int((y + h - 1) // self.cell) + 1):
+                    self.cells.setdefault((cx, cy), []).append(c)
+
+    def innermost(self, x, y, inside_of=None):
+        # Smallest container whose rectangle holds (x, y); ties go to the earliest in the layout.
+        # With inside_of, only containers that rank above it count, which rules out cycles.
+        limit = self.rank[id(inside_of)] if inside_of is not None else None
+        best, best_rank = None, None
+        for c in self.cells.get((int(x // self.cell), int(y // self.cell)), ()):
+            if c is inside_of:
+                continue
+            rank = self.rank[id(c)]
+            if limit is not None and (rank[0] < limit[0] or (rank[0] == limit[0] and rank[1] > limit[1])):
+                continue
+            cx, cy = c.get('x'), c.get('y')
+            if (cx <= x < cx + c.get('width')) and (cy <= y < cy + c.get('height')):
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = c, rank
+        return best
+
+# --- Incremental Reload ---
+
+# Properties an incremental reload can apply to an existing widget, per component type.
+# Any other property change recreates the component.
+LIVE_PROPERTIES = {
+    'Button': ('text', 'textColor', 'backgroundColor', 'fontFamily', 'fontSize', 'bold'),
+    'Label': ('text', 'textColor', 'fontFamily', 'fontSize', 'bold'),
+    'CardView': ('backgroundColor',),
+    'Panel': ('backgroundColor',),
+}
+_PROPERTY_OPTIONS = {'text': 'text', 'textColor': 'text_color', 'backgroundColor': 'fg_color'}
+
+# Built at their pixel size, so a size change recreates them instead of re-placing
+SIZED_TYPES = ('Image', 'Spinner')
+
 # --- Core GUI Building Logic ---
 
 class NVLibParser:
-    def __init__(self, master, debug=False):
+    def __init__(self, master, debug=False, image_cache=None, lazy=True, profiler=None):
         self.master = master
+        self.profiler = profiler
+        self.image_cache = image_cache or _image_cache
         self.widgets = {}
         self.image_references = []
         self.radio_groups = {}
         self.debug = debug
         self.original_canvas_width = 1
         self.original_canvas_height = 1
-
-    def _process_image(self, img, radius, opacity):
+        self.components = {}  # Component id -> layout data as last built
+        self.parent_ids = {}  # Component id -> id of its container, or None
+        self.lazy = lazy  # Defer hidden components (visible: false) and their contents until needed
+        self.deferred = {}       # Hidden component id -> [(data, parent data, compiled entry)] of its subtree
+        self.deferred_root = {}  # Deferred component id -> id of the hidden component it waits on
+
+    @staticmethod
+    def _process_image(img, radius, opacity):
         img = img.convert("RGBA")
+        if opacity >= 1.0 and radius <= 0:
+            return img
 
+        alpha = img.getchannel("A")
         if opacity < 1.0:
-            alpha = img.split()[3]
-            alpha = alpha.point(lambda p: p * opacity)
-            img.putalpha(alpha)
+            # Lookup table applied in C over the whole channel
+            alpha = alpha.point([int(p * opacity) for p in range(256)])
 
         if radius > 0:
             max_radius = min(img.size) // 2
@@ -252,78 +542,297 @@ class NVLibParser:
             mask = Image.new('L', img.size, 0)
             draw = ImageDraw.Draw(mask)
             draw.rounded_rectangle((0, 0) + img.size, radius=effective_radius, fill=255)
-            img.putalpha(mask)
+            alpha = ImageChops.multiply(alpha, mask)  # Rounds corners without dropping transparency
+        img.putalpha(alpha)
         
         return img
 
-    def build_from_json(self, file_path):
+    def load_layout(self, file_path):
         try:
             with open(file_path, 'r') as f:
-                layout = json.load(f)
+                return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error loading layout file: {e}")
             return None
 
+    def apply_canvas(self, layout):
         canvas_props = layout.get('canvas', {})
-        self.original_canvas_width = canvas_props.get('width', 800)
-        self.original_canvas_height = canvas_props.get('height', 600)
+        width = canvas_props.get('width', 800)
+        height = canvas_props.get('height', 600)
         title = canvas_props.get('title', 'NVLib Generated GUI')
-        self.master.geometry(f"{self.original_canvas_width}x{self.original_canvas_height}")
+        if (width, height) != (self.original_canvas_width, self.original_canvas_height):
+            # Only resize the window when the canvas itself changed, so a reload keeps the user's size
+            self.original_canvas_width, self.original_canvas_height = width, height
+            self.master.geometry(f"{width}x{height}")
+            self.master.minsize(width, height)
         self.master.title(title)
         self.master.resizable(True, True)
-        self.master.minsize(self.original_canvas_width, self.original_canvas_height)
+
+    def build_from_json(self, file_path):
+        with _span(self.profiler, 'build', 'load_compiled'):
+            compiled = load_compiled_layout(file_path)
+        if compiled is not None and self._compiled_for_display(compiled):
+            return self.build_from_compiled(compiled)
+
+        with _span(self.profiler, 'build', 'parse_json'):
+            layout = self.load_layout(file_path)
+        if layout is None:
+            return None
+        self.apply_canvas(layout)
 
         components_data = layout.get('components', [])
+        with _span(self.profiler, 'build', 'resolve_parents'):
+            ordered, parents = self.resolve_parents(components_data, self.original_canvas_width, self.original_canvas_height)
+
+        for data in ordered:
+            self._create_or_defer(data, parents.get(id(data)))
+        self._remember(ordered, parents)
         
-        containers = {c['id']: c for c in components_data if c.get('type') in ['CardView', 'Panel']}
-        all_other_components = [c for c in components_data if c.get('type') not in ['CardView', 'Panel']]
+        return self.widgets
 
-        for cid, data in containers.items():
-            self.create_component(data, self.master, 0, 0, self.original_canvas_width, self.original_canvas_height)
+    def _compiled_for_display(self, compiled):
+        # Compiled images only exist for the display scalings they were compiled for
+        if not compiled.get('images'):
+            return True
+        return round(_display_scaling(self.master), 3) in compiled.get('scalings', [])
+
+    def build_from_compiled(self, compiled):
+        # Builds from a compiled layout: parents, placements and fonts are already resolved and
+        # images are already decoded, so only the widgets themselves are created here
+        self.apply_canvas(compiled)
+        with _span(self.profiler, 'build', 'preload_images'):
+            self.image_cache.preload(compiled.get('images', {}))
+
+        by_id, ordered, parents = {}, [], {}
+        for entry in compiled.get('components', []):
+            data = entry['data']
+            parent_data = by_id.get(entry['parent'])
+            self._create_or_defer(data, parent_data, entry)
+            by_id[data.get('id')] = data
+            ordered.append(data)
+            parents[id(data)] = parent_data
+        self._remember(ordered, parents)
+        if self.debug:
+            print(f"Built {len(ordered)} components from compiled layout")
 
-        for data in all_other_components:
-            parent = self.master
-            parent_x, parent_y = 0, 0
-            parent_w, parent_h = self.original_canvas_width, self.original_canvas_height
-            
-            for cid, container_data in containers.items():
-                cx, cy = container_data.get('x'), container_data.get('y')
-                cw, ch = container_data.get('width'), container_data.get('height')
-                dx, dy = data.get('x'), data.get('y')
-                
-                if (cx <= dx < cx + cw) and (cy <= dy < cy + ch):
-                    parent = self.widgets[cid]['widget']
-                    parent_x, parent_y = cx, cy
-                    parent_w, parent_h = cw, ch
-                    break 
-            
-            self.create_component(data, parent, parent_x, parent_y, parent_w, parent_h)
-        
         return self.widgets
 
-    def create_component(self, data, parent, parent_x, parent_y, parent_w, parent_h):
+    def update_from_json(self, file_path):
+        # Incremental rebuild against the layout this parser built last, matched by component id.
+        # Unchanged components are left alone, moved or lightly edited ones are re-placed or
+        # reconfigured in place, and only the rest are destroyed and created again.
+        # Returns {'created': [...], 'updated': [...], 'removed': [...]} or None if the file won't load.
+        layout = self.load_layout(file_path)
+        if layout is None:
+            return None
+        self.apply_canvas(layout)
+
+        components_data = layout.get('components', [])
+        ordered, parents = self.resolve_parents(components_data, self.original_canvas_width, self.original_canvas_height)
+        parent_ids = {data.get('id'): self._id_of(parents.get(id(data))) for data in ordered}
+
+        new_ids = set(parent_ids)
+        removed = [comp_id for comp_id in self.components if comp_id not in new_ids]
+        self.deferred, self.deferred_root = {}, {}  # Components never created are simply reconsidered
+        recreate, updates = set(), {}
+        for data in ordered:  # Parents come before their children
+            comp_id = data.get('id')
+            changed = self._live_changes(comp_id, data, parent_ids[comp_id], recreate)
+            if changed is None:
+                recreate.add(comp_id)
+            else:
+                updates[comp_id] = changed
+
+        # Destroying a container takes its children with it, so only destroy the outermost ones
+        doomed = (set(removed) | recreate) & set(self.widgets)
+        for comp_id in doomed:
+            record = self.widgets.pop(comp_id)
+            if self.parent_ids.get(comp_id) not in doomed:
+                record['widget'].destroy()
+            if record.get('image') in self.image_references:
+                self.image_references.remove(record['image'])
+
+        updated = []
+        for data in ordered:
+            comp_id = data.get('id')
+            if comp_id in recreate:
+                self._create_or_defer(data, parents.get(id(data)))
+            elif self._reconfigure(comp_id, data, parents.get(id(data)), updates[comp_id]):
+                updated.append(comp_id)
+        self._remember(ordered, parents)
+
+        changes = {'created': [data.get('id') for data in ordered if data.get('id') in recreate and data.get('id') in self.widgets],
+                   'updated': updated, 'removed': removed}
+        if self.debug:
+            print(f"Reloaded layout: {len(changes['created'])} created, {len(updated)} updated, {len(removed)} removed")
+        return changes
+
+    def _live_changes(self, comp_id, data, parent_id, recreate):
+        # Changed property names that can be applied to the existing widget, or None to recreate it
+        old = self.components.get(comp_id)
+        if old is None or comp_id not in self.widgets:
+            return None
+        if old.get('type') != data.get('type') or parent_id != self.parent_ids.get(comp_id) or parent_id in recreate:
+            return None
+        if data.get('type') in SIZED_TYPES and (old.get('width'), old.get('height')) != (data.get('width'), data.get('height')):
+            return None
+
+        old_props, new_props = old.get('properties', {}), data.get('properties', {})
+        changed = {key for key in set(old_props) | set(new_props) if old_props.get(key) != new_props.get(key)}
+        live = LIVE_PROPERTIES.get(data.get('type'), ())
+        if any(key not in live or new_props.get(key) is None for key in changed):
+            return None
+        return changed
+
+    def _reconfigure(self, comp_id, data, parent_data, changed):
+        # Applies in-place changes to a kept component; returns True if anything changed
+        record = self.widgets[comp_id]
+        widget = record['widget']
+        props = data.get('properties', {})
+        options = {_PROPERTY_OPTIONS[key]: props.get(key) for key in changed if key in _PROPERTY_OPTIONS}
+        if 'text' in options and record['type'] == 'Label':
+            options['text'] = props.get('iconName') or props.get('text')
+        if changed & {'fontFamily', 'fontSize', 'bold'}:
+            # Update the shared font_info in place; the wrapper reads the same dict when rescaling
+            font_info = record['font_info']
+            font_info.update(self.font_spec(props))
+            options['font'] = get_font(font_info['family'], font_info['size'], font_info['weight'])
+        if options:
+            widget.configure(**options)
+
+        _, parent_x, parent_y, parent_w, parent_h = self._parent_box(parent_data)
+        layout_info = self.relative_layout(data, parent_x, parent_y, parent_w, parent_h)
+        moved = layout_info != record['layout']
+        if moved:
+            record['layout'].clear()
+            record['layout'].update(layout_info)  # Same dict the wrapper uses for toggle_visibility
+            if widget.winfo_manager() == 'place':
+                widget.place(**layout_info)
+        return bool(options) or moved
+
+    def _parent_box(self, parent_data):
+        # (parent widget, x, y, width, height) in canvas coordinates
+        if parent_data is None:
+            return self.master, 0, 0, self.original_canvas_width, self.original_canvas_height
+        return (self.widgets[parent_data['id']]['widget'], parent_data.get('x'), parent_data.get('y'),
+                parent_data.get('width'), parent_data.get('height'))
+
+    def _create(self, data, parent_data, entry=None):
+        if entry is None:
+            self.create_component(data, *self._parent_box(parent_data))
+        else:
+            self.create_component(data, *self._parent_box(parent_data),
+                                  layout_info=entry['layout'], font_info=entry['font'],
+                                  image_digest=entry.get('image'))
+
+    def _create_or_defer(self, data, parent_data, entry=None):
+        comp_id = data.get('id')
+        root_id = self.deferred_root.get(parent_data['id']) if parent_data is not None else None
+        if root_id is None and self.lazy and comp_id is not None and data.get('properties', {}).get('visible', True) is False:
+            root_id = comp_id
+            self.deferred[root_id] = []
+        if root_id is None:
+            self._create(data, parent_data, entry)
+        else:
+            self.deferred_root[comp_id] = root_id
+            self.deferred[root_id].append((data, parent_data, entry))
+
+    def materialize(self, comp_id):
+        # Creates a deferred component together with everything deferred with it (the hidden
+        # component it sits in and that one's contents). Returns the ids created.
+        root_id = self.deferred_root.get(comp_id)
+        if root_id is None:
+            return []
+        entries = self.deferred.pop(root_id)
+        with _span(self.profiler, 'build', 'materialize'):
+            for data, parent_data, entry in entries:
+                self.deferred_root.pop(data.get('id'), None)
+                self._create(data, parent_data, entry)
+        if self.debug:
+            print(f"Materialized '{root_id}' ({len(entries)} components)")
+        return [data.get('id') for data, _, _ in entries]
+
+    @staticmethod
+    def _id_of(data):
+        return data.get('id') if data is not None else None
+
+    def _remember(self, ordered, parents):
+        # The layout as built, for the next incremental update
+        self.components = {data.get('id'): data for data in ordered}
+        self.parent_ids = {data.get('id'): self._id_of(parents.get(id(data))) for data in ordered}
+
+    @staticmethod
+    def image_spec(data, scaling):
+        # (size, corner radius, opacity) an Image component is decoded at for a display scaling
+        props = data.get('properties', {})
+        size = (round(data.get('width') * scaling), round(data.get('height') * scaling))
+        return size, round(props.get('cornerRadius', 0) * scaling), props.get('opacity', 1.0)
+
+    @staticmethod
+    def font_spec(props):
+        return {'family': props.get('fontFamily', 'Arial'), 'size': props.get('fontSize', 10),
+                'weight': "bold" if props.get('bold') else "normal"}
+
+    @staticmethod
+    def relative_layout(data, parent_x, parent_y, parent_w, parent_h):
+        # place() options for a component, relative to its parent's box
+        relx = (data.get('x') - parent_x) / parent_w
+        rely = (data.get('y') - parent_y) / parent_h
+        if data.get('type') == 'Spinner':
+            return {'relx': relx, 'rely': rely}
+        return {'relx': relx, 'rely': rely, 'relwidth': data.get('width') / parent_w, 'relheight': data.get('height') / parent_h}
+
+    @staticmethod
+    def resolve_parents(components_data, canvas_width, canvas_height):
+        # Returns (components in creation order, {id(component): parent container data or None}).
+        # Each component goes into the innermost container holding its top-left corner, so Panels
+        # and CardViews nest to any depth. Containers come first, parents before children.
+        containers = [c for c in components_data if c.get('type') in CONTAINER_TYPES]
+        others = [c for c in components_data if c.get('type') not in CONTAINER_TYPES]
+        index = ContainerIndex(containers, canvas_width, canvas_height)
+
+        parents = {}
+        for container in containers:
+            parents[id(container)] = index.innermost(container.get('x'), container.get('y'), inside_of=container)
+        for data in others:
+            parents[id(data)] = index.innermost(data.get('x'), data.get('y'))
+
+        # Nesting depth of every container, walked iteratively so deep nesting is safe
+        depths = {}
+        for container in containers:
+            chain = []
+            node = container
+            while node is not None and id(node) not in depths:
+                chain.append(node)
+                node = parents[id(node)]
+            base = -1 if node is None else depths[id(node)]
+            for offset, item in enumerate(reversed(chain), 1):
+                depths[id(item)] = base + offset
+
+        ordered = sorted(containers, key=lambda c: depths[id(c)]) + others
+        return ordered, parents
+
+    def create_component(self, data, parent, parent_x, parent_y, parent_w, parent_h, layout_info=None, font_info=None,
+                         image_digest=None):
+        with _span(self.profiler, 'create', data.get('type')):
+            self._create_component(data, parent, parent_x, parent_y, parent_w, parent_h, layout_info, font_info,
+                                   image_digest)
+        if self.debug and data.get('id') in self.widgets:
+            print(f"Created Component: '{data.get('id')}' of type '{data.get('type')}'")  # Kept out of the timed span
+
+    def _create_component(self, data, parent, parent_x, parent_y, parent_w, parent_h, layout_info, font_info,
+                          image_digest):
         comp_type = data.get('type')
         props = data.get('properties', {})
         comp_id = data.get('id')
-        x, y, w, h = data.get('x'), data.get('y'), data.get('width'), data.get('height')
-        
-        rel_x_offset, rel_y_offset = x - parent_x, y - parent_y
-
-        relx = rel_x_offset / parent_w
-        rely = rel_y_offset / parent_h
-        relwidth = w / parent_w
-        relheight = h / parent_h
+        w, h = data.get('width'), data.get('height')
 
-        font_family = props.get('fontFamily', 'Arial')
-        font_size = props.get('fontSize', 10)
-        font_weight = "bold" if props.get('bold') else "normal"
-        custom_font = ctk.CTkFont(family=font_family, size=font_size, weight=font_weight)
-        font_info = {'family': font_family, 'size': font_size, 'weight': font_weight}
+        font_info = font_info or self.font_spec(props)
+        custom_font = get_font(font_info['family'], font_info['size'], font_info['weight'])
 
         widget = None
         variable = None
         wrapper_extras = {}
-        layout_info = {}
 
         # Most widgets are created directly on the parent
         container = parent
@@ -385,12 +894,14 @@ class NVLibParser:
         elif comp_type == 'Image':
             base64_str = props.get('src', '').split(',')[-1]
             try:
-                img_data = base64.b64decode(base64_str)
-                img = Image.open(io.BytesIO(img_data)).convert("RGBA")
+                scaling = _display_scaling(self.master)
+                with _span(self.profiler, 'image', 'decode'):
+                    img = self.image_cache.get(base64_str, *self.image_spec(data, scaling), digest=image_digest)
                 
                 ctk_image = ctk.CTkImage(light_image=img, dark_image=img, size=(w,h))
                 widget = ctk.CTkLabel(container, image=ctk_image, text="", fg_color="transparent")
                 self.image_references.append(ctk_image)
+                wrapper_extras = {'image': ctk_image}
 
             except Exception as e:
                 widget = ctk.CTkLabel(container, text="Image Error", fg_color="red")
@@ -500,16 +1011,13 @@ class NVLibParser:
             wrapper_extras = {'entry': entry, 'min_val': min_val, 'max_val': max_val, 'buttons': [minus_btn, plus_btn]}
 
         if widget:
-            if comp_type == 'Spinner':
-                layout_info = {'relx': relx, 'rely': rely}
-                widget.place(relx=relx, rely=rely)
-            else:
-                layout_info = {'relx': relx, 'rely': rely, 'relwidth': relwidth, 'relheight': relheight}
-                widget.place(relx=relx, rely=rely, relwidth=relwidth, relheight=relheight)
+            layout_info = layout_info or self.relative_layout(data, parent_x, parent_y, parent_w, parent_h)
+            visible = props.get('visible', True) is not False
+            if visible:
+                with _span(self.profiler, 'place', comp_type):
+                    widget.place(**layout_info)
             
-            self.widgets[comp_id] = {'widget': widget, 'layout': layout_info, 'type': comp_type, 'font_info': font_info, 'variable': variable, **wrapper_extras}
-            if self.debug:
-                print(f"Created Component: '{comp_id}' of type '{comp_type}'")
+            self.widgets[comp_id] = {'widget': widget, 'layout': layout_info, 'type': comp_type, 'font_info': font_info, 'variable': variable, 'visible': visible, **wrapper_extras}
 
 class AutoGUI(ctk.CTk):
     def _resolve_path(self, path):
@@ -522,71 +1030,274 @@ class AutoGUI(ctk.CTk):
     def __init__(self):
         super().__init__()
         self.widgets = {}
+        self._wrappers = {}  # Component id -> wrapper, built once per build_gui
         self._icon = None
         self.configure(fg_color="white")
         self.debug = False
         self.original_size = (1, 1) # width, height
+        self._resize_pending = None  # after_idle id while a rescale is scheduled
+        self._applied_scale = None   # Scale factor of the last rescale
+        self.image_cache = _image_cache  # Decoded images, shared across build_gui calls
+        self._parser = None          # Parser of the last build, kept for incremental reloads
+        self._layout_file = None
+        self._watch_job = None       # after() id of the layout file poll
+        self._layout_stamp = None
+        self._pending = {}           # Component id -> LazyWrapper for components not created yet
+        self.lazy_widgets = True     # Create hidden components only when first shown or used
+        self._updates = {}           # (component id, method) -> (args, kwargs), latest call wins
+        self._updates_lock = threading.Lock()
+        self._update_interval = 33   # ms between update batches (about 30 per second)
+        self._update_counts = {'posted': 0, 'coalesced': 0, 'applied': 0, 'dropped': 0}
+        self.profiler = None         # GUIProfiler while profiling is enabled
+        clear_font_cache()
         self.bind("<Configure>", self._on_resize)
+        self._update_job = self.after(self._update_interval, self._flush_updates)
 
     def _on_resize(self, event=None):
         if event.widget != self:
             return
-
-        width_scale = self.winfo_width() / self.original_size[0]
-        height_scale = self.winfo_height() / self.original_size[1]
-        
-        for name, info in self.widgets.items():
+        # A window drag fires many <Configure> events; coalesce them into one rescale per idle cycle
+        with _span(self.profiler, 'resize', 'configure_event'):
+            if self._resize_pending is None:
+                self._resize_pending = self.after_idle(self._apply_resize)
+
+    def _apply_resize(self):
+        with _span(self.profiler, 'resize', 'apply_resize'):
+            self._resize_pending = None
+            width_scale = self.winfo_width() / self.original_size[0]
+            height_scale = self.winfo_height() / self.original_size[1]
+            scale_factor = min(width_scale, height_scale)
+            if scale_factor == self._applied_scale:
+                return
+            self._applied_scale = scale_factor
+
+            with _span(self.profiler, 'resize', 'rescale_fonts'):
+                self._rescale(self._wrappers, scale_factor)
+
+    def _rescale(self, names, scale_factor):
+        for name in names:
             try:
-                if info['type'] != 'Spinner': # Exclude spinner from scaling
-                    wrapper = self.__getattr__(name)
-                    scale_factor = min(width_scale, height_scale)
-                    wrapper._rescale_font(scale_factor)
+                if self.widgets[name]['type'] != 'Spinner': # Exclude spinner from scaling
+                    self._wrappers[name]._rescale_font(scale_factor)
             except (AttributeError, KeyError):
                 pass
 
+    def _add_wrappers(self, names):
+        # Wrappers for newly created components; recorded calls on their stand-ins are replayed
+        for name in names:
+            self._wrappers[name] = self._create_wrapper(self.widgets[name])
+        for name in names:
+            pending = self._pending.pop(name, None)
+            if pending:
+                pending._resolve(self._wrappers[name])
+
+    def _materialize(self, name):
+        created = self._parser.materialize(name)
+        self._add_wrappers(created)
+        if self._applied_scale is not None:
+            self._rescale(created, self._applied_scale)
+        return self._wrappers.get(name)
+
 
     def __getattr__(self, name):
-        if name in self.widgets:
-            info = self.widgets[name]
-            comp_type = info['type']
-            font_info = info.get('font_info') # Use .get for safety
-            
-            if comp_type == 'Button':
-                return ButtonWrapper(info['widget'], info['layout'], font_info)
-            elif comp_type in ['TextBox', 'TextArea']:
-                return ValueWrapper(info['widget'], info['layout'], font_info, **info.get('wrapper_info', {}))
-            elif comp_type == 'Checkbox':
-                return CheckWrapper(info['widget'], info['layout'], font_info, info['variable'])
-            elif comp_type == 'RadioGroup':
-                return RadioGroupWrapper(info['widget'], info['layout'], font_info, info['variable'], info['radios'], info['label'])
-            elif comp_type == 'ToggleButton':
-                return ToggleWrapper(info['widget'], info['layout'], font_info, info['variable'])
-            elif comp_type == 'Dropdown':
-                return SelectWrapper(info['widget'], info['layout'], font_info, info['variable'])
-            elif comp_type == 'Slider':
-                return SliderWrapper(info['widget'], info['layout'], font_info)
-            elif comp_type == 'ProgressBar':
-                return ProgressWrapper(info['widget'], info['layout'], font_info, info['progress_bar'], info['label'])
-            elif comp_type == 'Spinner':
-                return SpinnerWrapper(info['widget'], info['layout'], font_info, info['entry'], info['min_val'], info['max_val'], info['buttons'])
-            else: # For Panel, CardView, Image
-                return BaseWrapper(info['widget'], info['layout'], font_info)
+        # Only called for names that are not real attributes; wrappers are a plain dict lookup.
+        # Read through __dict__ so lookups during CTk.__init__ cannot recurse.
+        wrappers = self.__dict__.get('_wrappers')
+        if wrappers and name in wrappers:
+            return wrappers[name]
+        parser = self.__dict__.get('_parser')
+        if parser and name in parser.deferred_root:
+            pending = self._pending.get(name)
+            if pending is None:
+                pending = self._pending[name] = LazyWrapper(self, name, parser.components[name].get('type'))
+            return pending
         raise AttributeError(f"'AutoGUI' object has no attribute '{name}'")
 
-    def build_gui(self, file_path):
-        for widget in self.winfo_children():
-            widget.destroy()
+    def _create_wrapper(self, info):
+        comp_type = info['type']
+        font_info = info.get('font_info') # Use .get for safety
+        
+        if comp_type == 'Button':
+            wrapper = ButtonWrapper(info['widget'], info['layout'], font_info)
+        elif comp_type in ['TextBox', 'TextArea']:
+            wrapper = ValueWrapper(info['widget'], info['layout'], font_info,
+                                info.get('hint_text', ''), info.get('hint_color', 'grey'))
+        elif comp_type == 'Checkbox':
+            wrapper = CheckWrapper(info['widget'], info['layout'], font_info, info['variable'])
+        elif comp_type == 'RadioGroup':
+            wrapper = RadioGroupWrapper(info['widget'], info['layout'], font_info, info['variable'], info['radios'], info['label'])
+        elif comp_type == 'ToggleButton':
+            wrapper = ToggleWrapper(info['widget'], info['layout'], font_info, info['variable'])
+        elif comp_type == 'Dropdown':
+            wrapper = SelectWrapper(info['widget'], info['layout'], font_info, info['variable'])
+        elif comp_type == 'Slider':
+            wrapper = SliderWrapper(info['widget'], info['layout'], font_info)
+        elif comp_type == 'ProgressBar':
+            wrapper = ProgressWrapper(info['widget'], info['layout'], font_info, info['progress_bar'], info['label'])
+        elif comp_type == 'Spinner':
+            wrapper = SpinnerWrapper(info['widget'], info['layout'], font_info, info['entry'], info['min_val'], info['max_val'], info['buttons'])
+        else: # For Panel, CardView, Image
+            wrapper = BaseWrapper(info['widget'], info['layout'], font_info)
+        wrapper.is_visible = info.get('visible', True)
+        return wrapper
+
+    def build_gui(self, file_path, incremental=False):
+        # incremental=True diffs against the previous build by component id and only touches the
+        # components that changed; the rest keep their callbacks, values and visibility.
+        if incremental and self._parser is not None:
+            with _span(self.profiler, 'build', 'reload_gui'):
+                self._reload_gui(file_path)
+            return
+
+        with _span(self.profiler, 'build', 'build_gui'):
+            self._build_gui(file_path)
+
+    def _build_gui(self, file_path):
+        self._wrappers = {}  # Old wrappers point at widgets destroyed below
+        self._pending = {}
+        with _span(self.profiler, 'build', 'destroy_widgets'):
+            for widget in self.winfo_children():
+                widget.destroy()
         resolved_path = self._resolve_path(file_path)
-        parser = NVLibParser(self, debug=self.debug)
+        parser = NVLibParser(self, debug=self.debug, image_cache=self.image_cache, lazy=self.lazy_widgets,
+                             profiler=self.profiler)
         self.widgets = parser.build_from_json(resolved_path)
+        self._parser = parser if self.widgets is not None else None
         if self.widgets is None:
             self.widgets = {}
+        self._layout_file = file_path
+        with _span(self.profiler, 'build', 'create_wrappers'):
+            self._wrappers = {name: self._create_wrapper(info) for name, info in self.widgets.items()}
+        self._applied_scale = None
         
         self.original_size = (parser.original_canvas_width, parser.original_canvas_height)
 
-            
-    def enable_debugging(self, enable=True):
+    def _reload_gui(self, file_path):
+        parser = self._parser
+        parser.debug = self.debug
+        parser.profiler = self.profiler
+        changes = parser.update_from_json(self._resolve_path(file_path))
+        if changes is None:
+            return  # Keep the current GUI when the file can't be loaded, e.g. mid-save
+        self._layout_file = file_path
+        self.widgets = parser.widgets
+
+        for name in changes['removed'] + changes['created']:
+            self._wrappers.pop(name, None)
+        for name in changes['removed']:
+            self._pending.pop(name, None)
+        self._add_wrappers(changes['created'])
+        for name in changes['updated']:
+            self._wrappers[name]._font_key = None  # Font may have changed; rescale it again
+
+        self.original_size = (parser.original_canvas_width, parser.original_canvas_height)
+        self._applied_scale = None
+        if self.winfo_ismapped():
+            self._apply_resize()  # No <Configure> arrives for a reload, so scale new widgets now
+
+    def watch_layout(self, interval=500):
+        # Hot reload: checks the layout file every interval ms and rebuilds incrementally when
+        # it changes on disk. Runs on the Tk event loop, so no extra thread touches the widgets.
+        if self._layout_file is None:
+            print("Error: build_gui must be called before watch_layout.")
+            return
+        self.stop_watching()
+        self._watch_interval = interval
+        self._layout_stamp = self._file_stamp()
+        self._watch_job = self.after(interval, self._check_layout)
+
+    def stop_watching(self):
+        if self._watch_job is not None:
+            self.after_cancel(self._watch_job)
+            self._watch_job = None
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self._resolve_path(self._layout_file))
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _check_layout(self):
+        try:
+            stamp = self._file_stamp()
+            if stamp is not None and stamp != self._layout_stamp:
+                self._layout_stamp = stamp
+                self.build_gui(self._layout_file, incremental=True)
+        except Exception as e:
+            # A half-saved or malformed layout must not stop the watcher; the next save retries
+            print(f"Error reloading layout: {e}")
+        finally:
+            self._watch_job = self.after(self._watch_interval, self._check_layout)
+
+    def post_update(self, name, method, *args, **kwargs):
+        # Thread-safe way to change a component from any thread, e.g.
+        # gui.post_update("progress", "set", 40) or gui.post_update("status", "text", "Done").
+        # Only the latest call per component and method is kept; calls are applied on the UI
+        # thread in one batch per frame.
+        key = (name, method)
+        with self._updates_lock:
+            self._update_counts['posted'] += 1
+            if key in self._updates:
+                self._update_counts['coalesced'] += 1
+            self._updates[key] = (args, kwargs)
+
+    def set_update_rate(self, fps):
+        # How many update batches per second post_update is applied at
+        self._update_interval = max(1, int(1000 / fps))
+
+    def update_stats(self):
+        # posted: calls received, coalesced: replaced by a newer call before being applied,
+        # applied: calls made, dropped: calls that failed (unknown component or method, bad value)
+        with self._updates_lock:
+            return dict(self._update_counts, pending=len(self._updates))
+
+    def _flush_updates(self):
+        with self._updates_lock:
+            batch, self._updates = self._updates, {}
+        applied = dropped = 0
+        with _span(self.profiler if batch else None, 'update', 'apply_batch'):
+            for (name, method), (args, kwargs) in batch.items():
+                try:
+                    getattr(getattr(self, name), method)(*args, **kwargs)
+                    applied += 1
+                except Exception as e:
+                    dropped += 1
+                    if self.debug:
+                        print(f"Dropped update {name}.{method}: {e}")
+        if batch:
+            with self._updates_lock:
+                self._update_counts['applied'] += applied
+                self._update_counts['dropped'] += dropped
+        self._update_job = self.after(self._update_interval, self._flush_updates)
+
+    def set_image_cache_dir(self, path):
+        # Persist decoded images to disk so later startups skip decoding
+        self.image_cache.set_folder(path)
+
+    def enable_debugging(self, enable=True, profile=False):
+        # enable turns on console output. profile=True records build, resize and update timings
+        # for profile_report(); it works on its own, e.g. enable_debugging(False, profile=True)
+        # profiles without any console output.
         self.debug = enable
+        self.profiler = GUIProfiler() if profile else None
+
+    def profile_report(self, trace_path=None):
+        # Timings per phase and component type since profiling was enabled:
+        # {category: {name: {'count', 'total_ms', 'mean_ms', 'max_ms'}}}. Categories are 'build',
+        # 'create' and 'place' (per component type), 'image', 'resize' and 'update'.
+        # trace_path also writes a Chrome trace JSON (chrome://tracing, ui.perfetto.dev).
+        if self.profiler is None:
+            print("Profiling is off; call enable_debugging(profile=True) first.")
+            return {}
+        if trace_path:
+            self.profiler.save_trace(trace_path)
+        return self.profiler.report()
+
+    def enable_lazy_widgets(self, enable=True):
+        # When on (the default), components with "visible": false in the layout, and everything
+        # inside them, are created the first time they are shown or used. Applies to the next build_gui.
+        self.lazy_widgets = enable
 
     def set_title(self, title):
         self.title(title)
@@ -622,6 +1333,8 @@ class AutoGUI(ctk.CTk):
             self.build_gui(file_path)
 
     def close_gui(self):
+        self.stop_watching()
+        self.after_cancel(self._update_job)
         self.destroy()
 
     def run(self):
@@ -0,0 +1,79 @@
+import argparse
+import base64
+import json
+import zlib
+
+from .AutoGUI import (COMPILED_LAYOUT_VERSION, ImageCache, NVLibParser, compiled_layout_path, source_hash)
+
+# Compiles layout JSON files ahead of time into .nvlayout files next to them. AutoGUI.build_gui
+# uses the compiled file whenever it matches the layout JSON byte for byte and the display
+# scaling is one it was compiled for, skipping parent resolution, placement and font math and
+# image decoding at startup. Images are stored only in decoded form, not as base64 sources.
+# Run from the folder that contains NVLib:
+#   python -m NVLib.Components.GUI.LayoutCompiler layout.json --scaling 1.0 1.5
+
+def compile_layout(file_path, scalings=(1.0,)):
+    # scalings: display scaling factors to pre-decode images for (CustomTkinter's DPI scaling)
+    with open(file_path, 'r') as f:
+        layout = json.load(f)
+
+    canvas = layout.get('canvas', {})
+    canvas_w, canvas_h = canvas.get('width', 800), canvas.get('height', 600)
+    ordered, parents = NVLibParser.resolve_parents(layout.get('components', []), canvas_w, canvas_h)
+
+    images = ImageCache(max_bytes=None)  # Every image goes into the compiled file
+    components = []
+    for data in ordered:
+        parent = parents.get(id(data))
+        if parent is None:
+            box = (0, 0, canvas_w, canvas_h)
+        else:
+            box = (parent.get('x'), parent.get('y'), parent.get('width'), parent.get('height'))
+        props = data.get('properties', {})
+        entry = {
+            'data': data,
+            'parent': parent.get('id') if parent is not None else None,
+            'layout': NVLibParser.relative_layout(data, *box),
+            'font': NVLibParser.font_spec(props),
+        }
+
+        if data.get('type') == 'Image':
+            src = props.get('src', '').split(',')[-1]
+            for scaling in scalings:
+                try:
+                    images.get(src, *NVLibParser.image_spec(data, scaling))
+                except Exception as e:
+                    print(f"Error compiling image '{data.get('id')}': {e}")
+            # The decoded images replace the source; the digest is enough to look them up
+            entry['data'] = dict(data, properties={k: v for k, v in props.items() if k != 'src'})
+            entry['image'] = ImageCache.digest(src)
+        components.append(entry)
+
+    header = {'version': COMPILED_LAYOUT_VERSION, 'source_sha256': source_hash(file_path)}
+    body = {
+        'canvas': canvas,
+        'scalings': sorted({round(scaling, 3) for scaling in scalings}),
+        'components': components,
+        'images': {key: {'size': list(img.size),
+                         'data': base64.b64encode(zlib.compress(img.convert("RGBA").tobytes())).decode('ascii')}
+                   for key, img in images.images.items()},
+    }
+    output_path = compiled_layout_path(file_path)  # The only place AutoGUI looks for it
+    with open(output_path, 'w') as f:
+        f.write(json.dumps(header) + "\n")
+        f.write(json.dumps(body, separators=(',', ':')) + "\n")
+    return output_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile NVLib layout JSON files for faster AutoGUI startup")
+    parser.add_argument("layouts", nargs="+", help="Layout JSON files")
+    parser.add_argument("--scaling", type=float, nargs="+", default=[1.0],
+                        help="Display scaling factors to pre-decode images for")
+    args = parser.parse_args(argv)
+
+    for layout in args.layouts:
+        output_path = compile_layout(layout, args.scaling)
+        print(f"Compiled '{layout}' -> '{output_path}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import itertools
+import json
+import os
+import time
+import numpy as np
+
+# Picks the cheapest detector configuration that still meets a target FPS and agrees with the
+# most accurate configuration, by timing candidates on a short calibration run. The choice is
+# saved so later startups can use it directly (HandTracker.from_tuned / FaceHandDetector.from_tuned).
+
+# Folder for VisualRec data such as the tuning file. Set with set_data_dir() or NVLIB_VISUALREC_DIR.
+_data_dir = os.environ.get("NVLIB_VISUALREC_DIR") or os.path.join("NVLib", "VisualRec-Data")
+
+def set_data_dir(path):
+    global _data_dir
+    _data_dir = path
+
+def tuning_file():
+    return os.path.join(_data_dir, "tuning.json")
+
+def _grid(**options):
+    keys = list(options)
+    return [dict(zip(keys, values)) for values in itertools.product(*options.values())]
+
+# The first candidate of each grid is the reference every other candidate is compared against
+HAND_TRACKER_CANDIDATES = _grid(model_complexity=[1, 0], inference_width=[None, 960, 640, 480], roi=[False, True])
+FACE_HAND_CANDIDATES = _grid(model_complexity=[1, 0], inference_width=[None, 640, 480], roi=[False, True])
+
+def _sorted_hands(points, handedness):
+    order = np.argsort(points[:, 0, 0]) if len(points) else []
+    return points[order], np.asarray(handedness)[order]
+
+def results_agree(a, b, tolerance=0.05):
+    #Compares two frame_result records: booleans must match, hands must match in count and
+    #handedness with mean landmark offset below tolerance (normalized units)
+    if 'points' in a:
+        points_a, hands_a = _sorted_hands(a['points'], a['handedness'])
+        points_b, hands_b = _sorted_hands(b['points'], b['handedness'])
+        if points_a.shape != points_b.shape or not np.array_equal(hands_a, hands_b):
+            return False
+        return not len(points_a) or float(np.abs(points_a[..., :2] - points_b[..., :2]).mean()) < tolerance
+    return all(a[key] == b[key] for key in a if not isinstance(a[key], np.ndarray))
+
+def measure(detector_class, config, frames, warmup=5):
+    #Returns (fps, records) for one configuration over the calibration frames
+    detector = detector_class(**config)
+    records = []
+    start = None
+    try:
+        for index, frame in enumerate(frames):
+            if index == warmup:
+                start = time.perf_counter()
+            records.append(detector.frame_result(frame))
+    finally:
+        if hasattr(detector, 'close'):
+            detector.close()  # Every candidate builds its own graphs; free them before the next one
+    timed = len(frames) - warmup
+    elapsed = time.perf_counter() - start if start else 0.0
+    return (timed / elapsed if elapsed > 0 else 0.0), records
+
+def tune(detector_class, frames, candidates, target_fps, min_agreement, path=None, base_config=None, save=True):
+    #path defaults to tuning_file(); save=False only returns the choice
+    frames = list(frames)
+    if len(frames) < 10:
+        raise ValueError("Auto-tune needs at least 10 calibration frames.")
+    base_config = base_config or {}
+    warmup = min(5, len(frames) // 4)
+
+    results = []
+    reference = None
+    for candidate in candidates:
+        config = dict(base_config, **candidate)
+        fps, records = measure(detector_class, config, frames, warmup)
+        if reference is None:
+            reference = records
+        agreement = sum(results_agree(r, ref) for r, ref in zip(records, reference)) / len(records)
+        results.append({'config': candidate, 'fps': fps, 'agreement': agreement})
+
+    qualifying = [r for r in results if r['fps'] >= target_fps and r['agreement'] >= min_agreement]
+    if qualifying:
+        chosen = max(qualifying, key=lambda r: r['fps'])
+    else:
+        fast_enough = [r for r in results if r['fps'] >= target_fps]
+        chosen = max(fast_enough, key=lambda r: r['agreement']) if fast_enough else max(results, key=lambda r: r['fps'])
+        print(f"Auto-tune: no configuration met {target_fps} FPS at {min_agreement:.0%} agreement, "
+              f"using {chosen['config']} ({chosen['fps']:.1f} FPS, {chosen['agreement']:.0%} agreement).")
+
+    height, width = frames[0].shape[:2]
+    entry = {
+        'config': dict(base_config, **chosen['config']),
+        'fps': chosen['fps'],
+        'agreement': chosen['agreement'],
+        'target_fps': target_fps,
+        'min_agreement': min_agreement,
+        'frame_size': [width, height],
+        'tuned_at': time.time(),
+    }
+    if save:
+        save_tuned_config(detector_class, entry, path)
+    return dict(entry, candidates=results)
+
+def save_tuned_config(detector_class, entry, path=None):
+    path = path or tuning_file()
+    saved = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                saved = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            saved = {}
+    saved[detector_class.__name__] = entry
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(saved, f, indent=4)
+
+def load_tuned_config(detector_class, path=None):
+    #Returns the saved configuration for detector_class, or {} when nothing was tuned yet
+    try:
+        with open(path or tuning_file(), 'r') as f:
+            return json.load(f).get(detector_class.__name__, {}).get('config', {})
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error loading tuned configuration: {e}")
+        return {}
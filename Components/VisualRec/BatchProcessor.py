@@ -0,0 +1,200 @@
+import cv2
+import json
+import os
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Headless, offline processing of recorded video. A video is split into frame ranges that
+# run across a process pool; every worker builds its own detector (one MediaPipe graph per
+# process) and results are streamed back in frame order. No camera or display is needed.
+#
+# Chunks start with a CAP_PROP_POS_FRAMES seek, which many codecs only honour to the nearest
+# keyframe, so a chunk boundary can land a few frames off and frames near it may be repeated or
+# skipped. workers=1 reads the whole video in one pass without seeking and is frame-exact.
+
+# --- Result sinks ---
+
+class JSONLSink:
+    # One JSON object per frame
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps({key: _to_json(value) for key, value in record.items()}) + "\n")
+
+    def close(self):
+        self.file.close()
+
+class NPZSink:
+    # Columnar arrays in one compressed .npz. Per-hand arrays are concatenated along the first
+    # axis, with '<key>_count' holding how many rows belong to each frame.
+    def __init__(self, path):
+        self.path = path
+        self.columns = {}
+
+    def write(self, record):
+        for key, value in record.items():
+            if isinstance(value, np.ndarray):
+                self.columns.setdefault(key, []).append(value)
+                self.columns.setdefault(f"{key}_count", []).append(len(value))
+            else:
+                self.columns.setdefault(key, []).append(value)
+
+    def close(self):
+        arrays = {}
+        for key, values in self.columns.items():
+            if values and isinstance(values[0], np.ndarray):
+                arrays[key] = np.concatenate(values)
+            else:
+                arrays[key] = np.asarray(values)
+        np.savez_compressed(self.path, **arrays)
+
+class ParquetSink:
+    # Parquet table with one row per frame; needs pyarrow
+    def __init__(self, path, batch_size=1000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ParquetSink requires pyarrow: pip install pyarrow")
+        self.pa = pyarrow
+        self.path = path
+        self.batch_size = batch_size
+        self.rows = []
+        self.writer = None
+
+    def write(self, record):
+        self.rows.append({key: _to_json(value) for key, value in record.items()})
+        if len(self.rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.rows:
+            return
+        table = self.pa.Table.from_pylist(self.rows)
+        if self.writer is None:
+            self.writer = self.pa.parquet.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.rows = []
+
+    def close(self):
+        self._flush()
+        if self.writer:
+            self.writer.close()
+
+SINKS = {'.jsonl': JSONLSink, '.npz': NPZSink, '.parquet': ParquetSink}
+
+def open_sink(sink):
+    # Accepts a sink object or a file path whose extension picks the format
+    if not isinstance(sink, (str, os.PathLike)):
+        return sink
+    extension = os.path.splitext(str(sink))[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported sink format '{extension}'. Use one of: {', '.join(SINKS)}")
+    return SINKS[extension](sink)
+
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+# --- Processing ---
+
+def process_frames(detector, frames, fps=None):
+    # Runs detector.frame_result over an iterable of frames (or (timestamp_ms, frame) pairs)
+    # in this process and yields one record per frame
+    for index, item in enumerate(frames):
+        if isinstance(item, tuple):
+            timestamp, frame = item
+        else:
+            timestamp, frame = (index * 1000.0 / fps if fps else None), item
+        record = {'frame': index, 'timestamp': timestamp}
+        record.update(detector.frame_result(frame))
+        yield record
+
+_worker_detector = None
+
+def _init_worker(detector_class, config):
+    global _worker_detector
+    _worker_detector = detector_class(**config)
+
+def _process_chunk(path, start, end, fps, detector=None):
+    # Worker task: decode and process frames [start, end) of the video; end=None reads to EOF
+    detector = detector or _worker_detector
+    cap = cv2.VideoCapture(path)
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    records = []
+    index = start
+    while end is None or index < end:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        record = {'frame': index, 'timestamp': index * 1000.0 / fps}
+        record.update(detector.frame_result(frame))
+        records.append(record)
+        index += 1
+    cap.release()
+    return records
+
+def video_info(path):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Could not open video: {path}")
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    return frame_count, fps
+
+def iter_video(detector_class, config, path, workers=None, chunk_frames=300):
+    # Yields per-frame records for a video file in timestamp order, processing chunks in parallel
+    frame_count, fps = video_info(path)
+    workers = workers or os.cpu_count() or 1
+    if frame_count <= 0 and workers > 1:
+        # Many streams and containers report no frame count, so there is nothing to split on
+        print(f"Warning: '{path}' reports no frame count; processing it sequentially.")
+        workers = 1
+
+    if workers == 1:
+        detector = detector_class(**config)
+        try:
+            yield from _process_chunk(path, 0, None, fps, detector)
+        finally:
+            if hasattr(detector, 'close'):
+                detector.close()
+        return
+
+    # The count can be an estimate, so the last chunk reads on to the end of the file
+    chunks = [(start, start + chunk_frames) for start in range(0, frame_count, chunk_frames)]
+    chunks[-1] = (chunks[-1][0], None)
+
+    # Spawned, not forked: a forked child would inherit the parent's live MediaPipe graphs and crash
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(detector_class, config)) as pool:
+        # Keep a bounded window of chunks in flight so results stream out in order
+        pending = []
+        chunk_iter = iter(chunks)
+        for start, end in chunk_iter:
+            pending.append(pool.submit(_process_chunk, path, start, end, fps))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            yield from pending.pop(0).result()
+            for start, end in chunk_iter:
+                pending.append(pool.submit(_process_chunk, path, start, end, fps))
+                break
+
+def process_video(detector_class, config, path, sink, workers=None, chunk_frames=300):
+    # Streams every frame's record into sink (object or .jsonl/.npz/.parquet path), returns the frame count
+    sink = open_sink(sink)
+    count = 0
+    try:
+        for record in iter_video(detector_class, config, path, workers, chunk_frames):
+            sink.write(record)
+            count += 1
+    finally:
+        sink.close()
+    return count
@@ -0,0 +1,90 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import namedtuple
+
+# kind is 'face', 'left_hand' or 'right_hand'; timestamp is when the new state started (time.time()).
+# confidence is the handedness score for hands. MediaPipe FaceMesh reports no score, so it is
+# always None for face events.
+DetectionEvent = namedtuple('DetectionEvent', ['kind', 'present', 'timestamp', 'confidence'])
+
+EVENT_KINDS = ('face', 'left_hand', 'right_hand')
+
+class DetectionEventStream:
+    # Turns per-frame detection results into debounced change events. A state change is only
+    # reported once it has held for debounce_frames consecutive frames. The inference loop just
+    # hands changes to a queue; a dispatcher thread fans them out to callbacks and async streams.
+    def __init__(self, debounce_frames=3):
+        self.debounce_frames = max(1, debounce_frames)
+        self.state = {kind: None for kind in EVENT_KINDS}
+        self._candidate = {kind: None for kind in EVENT_KINDS}  # (value, first seen, frames seen)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._dispatcher = None
+
+    def update(self, face, left_hand, right_hand, confidences=None, timestamp=None):
+        #Feeds one frame of results; confidences maps kind to score where known
+        timestamp = time.time() if timestamp is None else timestamp
+        confidences = confidences or {}
+        for kind, present in zip(EVENT_KINDS, (face, left_hand, right_hand)):
+            if present == self.state[kind]:
+                self._candidate[kind] = None
+                continue
+
+            candidate = self._candidate[kind]
+            if candidate is None or candidate[0] != present:
+                candidate = (present, timestamp, 1)
+            else:
+                candidate = (present, candidate[1], candidate[2] + 1)
+
+            if candidate[2] >= self.debounce_frames:
+                self.state[kind] = present
+                self._candidate[kind] = None
+                if self._subscribers:
+                    self._queue.put(DetectionEvent(kind, present, candidate[1], confidences.get(kind)))
+            else:
+                self._candidate[kind] = candidate
+
+    def subscribe(self, callback):
+        #Calls callback(event) from the dispatcher thread for every change; returns an unsubscribe function
+        with self._lock:
+            self._subscribers.append(callback)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+                self._dispatcher.start()
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    async def events(self, max_queue=100):
+        #Async generator of DetectionEvents. A slow consumer drops its oldest events, never blocks inference.
+        loop = asyncio.get_running_loop()
+        pending = asyncio.Queue(max_queue)
+
+        def offer(event):
+            if pending.full():
+                pending.get_nowait()
+            pending.put_nowait(event)
+
+        unsubscribe = self.subscribe(lambda event: loop.call_soon_threadsafe(offer, event))
+        try:
+            while True:
+                yield await pending.get()
+        finally:
+            unsubscribe()
+
+    def _dispatch(self):
+        while True:
+            event = self._queue.get()
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Error in detection event subscriber: {e}")
@@ -1,52 +1,92 @@
 import cv2
-import mediapipe as mp
-import logging
-import sys
-import warnings
-import os
-
-logging.getLogger("tensorflow").setLevel(logging.ERROR)
-logging.getLogger("absl").setLevel(logging.ERROR)
-sys.stderr = open(os.devnull, 'w')
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
-warnings.filterwarnings("ignore")
+from . import MediaPipe
+from .RegionTracker import RegionTracker
+from .LandmarkArray import landmarks_to_array
+from . import BatchProcessor
+from .DetectionEvents import DetectionEventStream
+from . import AutoTune
 
 class FaceHandDetector:
-    def __init__(self, face_confidence=0.9, hand_confidence=0.9):
+    def __init__(self, face_confidence=0.9, hand_confidence=0.9, inference_width=None, roi=False, roi_padding=0.25,
+                 debounce_frames=3, model_complexity=1, max_num_hands=2, max_num_faces=1,
+                 refine_landmarks=False, static_image_mode=False):
+        self.config = {key: value for key, value in locals().items() if key != 'self'}  # Rebuilds workers
+        mp = MediaPipe.load()
         self.mp_face_mesh = mp.solutions.face_mesh
         self.mp_hands = mp.solutions.hands
         
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            min_detection_confidence=face_confidence,
-            min_tracking_confidence=face_confidence
-        )
-        self.hands = self.mp_hands.Hands(
-            min_detection_confidence=hand_confidence,
-            min_tracking_confidence=hand_confidence
-        )
+        with MediaPipe.quiet():  # Only graph setup is silenced; later errors still reach stderr
+            self.face_mesh = self.mp_face_mesh.FaceMesh(
+                static_image_mode=static_image_mode,
+                max_num_faces=max_num_faces,
+                refine_landmarks=refine_landmarks,
+                min_detection_confidence=face_confidence,
+                min_tracking_confidence=face_confidence
+            )
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=static_image_mode,
+                max_num_hands=max_num_hands,
+                model_complexity=model_complexity,
+                min_detection_confidence=hand_confidence,
+                min_tracking_confidence=hand_confidence
+            )
         
+        # inference_width downscales frames before inference; roi crops to the last detection
+        self.face_region = RegionTracker(inference_width, roi, roi_padding, expected=max_num_faces)
+        self.hand_region = RegionTracker(inference_width, roi, roi_padding, expected=max_num_hands)
+
+        # Debounced change events for subscribers; fed by observe() and run_continuous()
+        self.events = DetectionEventStream(debounce_frames)
+        self.hand_scores = {'left_hand': None, 'right_hand': None}
+
         self.previous_face_state = None
         self.previous_left_hand = None
         self.previous_right_hand = None
     
+    @classmethod
+    def from_tuned(cls, path=None, **overrides):
+        #Builds a detector with the configuration saved by auto_tune, or the defaults if none is saved
+        return cls(**dict(AutoTune.load_tuned_config(cls, path), **overrides))
+
+    @classmethod
+    def auto_tune(cls, frames, target_fps=15, min_agreement=0.9, path=None, **base_config):
+        #Times candidate configurations on sample frames and saves the cheapest one meeting
+        #target_fps and agreeing with the most accurate configuration on min_agreement of frames
+        return AutoTune.tune(cls, frames, AutoTune.FACE_HAND_CANDIDATES, target_fps, min_agreement,
+                             path, base_config)
+
+    def _process(self, model, region_tracker, frame, landmarks_of):
+        rgb_frame, region = region_tracker.prepare(frame)
+        results = model.process(rgb_frame)
+        if not landmarks_of(results) and region_tracker.is_cropped(region, frame):
+            # Track lost inside the ROI: search the full frame again
+            rgb_frame, region = region_tracker.prepare(frame, full_frame=True)
+            results = model.process(rgb_frame)
+        if region_tracker.roi:
+            region_tracker.update(landmarks_to_array(landmarks_of(results)), region, frame)
+        return results
+
     def detect_face(self, frame):
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        face_results = self.face_mesh.process(rgb_frame)
+        face_results = self._process(self.face_mesh, self.face_region, frame,
+                                     lambda results: results.multi_face_landmarks)
         return face_results.multi_face_landmarks is not None
     
     def detect_hands(self, frame):
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        hand_results = self.hands.process(rgb_frame)
+        hand_results = self._process(self.hands, self.hand_region, frame,
+                                     lambda results: results.multi_hand_landmarks)
         left_hand_detected = False
         right_hand_detected = False
+        self.hand_scores = {'left_hand': None, 'right_hand': None}
         
         if hand_results.multi_handedness:
             for classification in hand_results.multi_handedness:
                 label = classification.classification[0].label
                 if label == "Left":
                     left_hand_detected = True
+                    self.hand_scores['left_hand'] = classification.classification[0].score
                 elif label == "Right":
                     right_hand_detected = True
+                    self.hand_scores['right_hand'] = classification.classification[0].score
         
         return left_hand_detected, right_hand_detected
     
@@ -67,6 +107,33 @@ class FaceHandDetector:
         
         return changes
     
+    def observe(self, frame):
+        #Detects face and hands in frame and feeds the debounced event stream (self.events).
+        #Consumers use self.events.subscribe(callback) or `async for event in self.events.events()`.
+        face_detected = self.detect_face(frame)
+        left_hand_detected, right_hand_detected = self.detect_hands(frame)
+        self.events.update(face_detected, left_hand_detected, right_hand_detected, self.hand_scores)
+        return face_detected, left_hand_detected, right_hand_detected
+
+    def frame_result(self, frame):
+        #Per-frame record used by the offline processing API
+        left_hand_detected, right_hand_detected = self.detect_hands(frame)
+        return {'face': self.detect_face(frame), 'left_hand': left_hand_detected, 'right_hand': right_hand_detected}
+
+    def process_frames(self, frames, fps=None):
+        #Yields a record per frame for any iterable of frames (or (timestamp_ms, frame) pairs), headless
+        return BatchProcessor.process_frames(self, frames, fps)
+
+    def process_video(self, path, sink, workers=None, chunk_frames=300):
+        #Processes a video file across a process pool (one MediaPipe graph per worker) and
+        #streams the records in frame order to sink: a .jsonl/.npz/.parquet path or sink object
+        return BatchProcessor.process_video(FaceHandDetector, self.config, path, sink, workers, chunk_frames)
+
+    def close(self):
+        #Releases the MediaPipe graphs; the detector can't detect anything afterwards
+        self.face_mesh.close()
+        self.hands.close()
+
     def run_continuous(self):
         cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)  # Faster webcam access
         if not cap.isOpened():
@@ -81,8 +148,7 @@ class FaceHandDetector:
             # Mirror the camera frame before any processing
             frame = cv2.flip(frame, 1)  # Flip the frame horizontally
             
-            face_detected = self.detect_face(frame)
-            left_hand_detected, right_hand_detected = self.detect_hands(frame)
+            face_detected, left_hand_detected, right_hand_detected = self.observe(frame)
             
             changes = self.check_changes(face_detected, left_hand_detected, right_hand_detected)
             if changes:
@@ -95,6 +161,8 @@ class FaceHandDetector:
         cap.release()
         cv2.destroyAllWindows()
 
+# Demo; run it as a module so the package-relative imports resolve:
+#   python -m NVLib.Components.VisualRec.FLRH
 if __name__ == "__main__":
     detector = FaceHandDetector()
     detector.run_continuous()
@@ -0,0 +1,63 @@
+import numpy as np
+from .LandmarkArray import RIGHT_HAND
+
+# Vectorized hand features over (hands, 21, 3) landmark arrays, as returned by
+# HandTracker.get_landmark_array. Every function handles all hands at once.
+
+WRIST = 0
+THUMB_IP, THUMB_TIP = 3, 4
+INDEX_MCP, INDEX_TIP = 5, 8
+MIDDLE_MCP = 9
+PINKY_MCP = 17
+FINGER_TIPS = [8, 12, 16, 20]  # Index, middle, ring, pinky
+FINGER_PIPS = [6, 10, 14, 18]
+
+def finger_extension(points):
+    # (hands, 5) bool: thumb, index, middle, ring, pinky extended
+    extended = np.empty(points.shape[:1] + (5,), dtype=bool)
+
+    # A finger is extended when its tip is further from the wrist than its PIP joint
+    wrist = points[:, WRIST:WRIST + 1]
+    tip_dist = np.linalg.norm(points[:, FINGER_TIPS] - wrist, axis=-1)
+    pip_dist = np.linalg.norm(points[:, FINGER_PIPS] - wrist, axis=-1)
+    extended[:, 1:] = tip_dist > pip_dist
+
+    # The thumb folds across the palm, so compare against the pinky knuckle instead
+    pinky = points[:, PINKY_MCP]
+    extended[:, 0] = (np.linalg.norm(points[:, THUMB_TIP] - pinky, axis=-1) >
+                      np.linalg.norm(points[:, THUMB_IP] - pinky, axis=-1))
+    return extended
+
+def palm_size(points):
+    # (hands,) wrist to middle knuckle distance, used to make distances scale-invariant
+    return np.linalg.norm(points[:, MIDDLE_MCP] - points[:, WRIST], axis=-1)
+
+def pinch_distance(points, normalize=True):
+    # (hands,) thumb tip to index tip distance, in palm sizes when normalize is set
+    distance = np.linalg.norm(points[:, THUMB_TIP] - points[:, INDEX_TIP], axis=-1)
+    if normalize:
+        distance = distance / np.maximum(palm_size(points), 1e-6)
+    return distance
+
+def pointing_vector(points):
+    # (hands, 3) unit vector from the index knuckle to the index tip
+    vector = points[:, INDEX_TIP] - points[:, INDEX_MCP]
+    return vector / np.maximum(np.linalg.norm(vector, axis=-1, keepdims=True), 1e-6)
+
+def palm_facing(points, handedness):
+    # (hands,) bool: palm turned towards the camera. Uses the winding of wrist, index and
+    # pinky knuckles in the image plane; MediaPipe's handedness label is derived from the
+    # image itself, so this holds for mirrored and unmirrored frames alike.
+    a = points[:, INDEX_MCP, :2] - points[:, WRIST, :2]
+    b = points[:, PINKY_MCP, :2] - points[:, WRIST, :2]
+    winding = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+    return np.where(np.asarray(handedness) == RIGHT_HAND, winding < 0, winding > 0)
+
+def hand_features(points, handedness):
+    # All features at once, keyed by name
+    return {
+        'fingers_extended': finger_extension(points),
+        'pinch_distance': pinch_distance(points),
+        'pointing_vector': pointing_vector(points),
+        'palm_facing': palm_facing(points, handedness),
+    }
@@ -1,9 +1,84 @@
 import cv2
-import mediapipe as mp
+import numpy as np
+import math
+import time
+from .RegionTracker import RegionTracker
+from .LandmarkArray import landmarks_to_array, handedness_to_array, array_to_landmarks, UNKNOWN_HAND
+from . import BatchProcessor
+from . import AutoTune
+from . import MediaPipe
+
+class _AdaptiveScheduler:
+    # Decides on which frames full hand inference runs. Between inferences the tracker
+    # returns landmarks extrapolated from the last two detections.
+    def __init__(self, inference_interval=3, max_inference_interval=10, motion_threshold=8.0,
+                 target_fps=None, cpu_budget=None):
+        self.interval = max(1, int(inference_interval))
+        self.max_interval = max(self.interval, int(max_inference_interval))
+        self.motion_threshold = motion_threshold
+        self.target_fps = target_fps
+        self.cpu_budget = cpu_budget
+
+        self.frames_since_inference = self.interval  # Forces inference on the first frame
+        self.previous_thumbnail = None
+        self.inference_time = None  # Smoothed seconds per inference
+        self.frame_period = None    # Smoothed seconds between frames
+        self.last_frame_time = None
+
+    def _motion_detected(self, frame):
+        # Cheap frame difference on a tiny grayscale thumbnail
+        thumbnail = cv2.cvtColor(cv2.resize(frame, (64, 36), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        previous, self.previous_thumbnail = self.previous_thumbnail, thumbnail
+        if previous is None or self.motion_threshold is None:
+            return False
+        return cv2.absdiff(thumbnail, previous).mean() > self.motion_threshold
+
+    def should_infer(self, frame):
+        now = time.perf_counter()
+        if self.last_frame_time is not None:
+            self.frame_period = self._smooth(self.frame_period, now - self.last_frame_time)
+        self.last_frame_time = now
+
+        moved = self._motion_detected(frame)
+        self.frames_since_inference += 1
+        if moved or self.frames_since_inference >= self.interval:
+            self.frames_since_inference = 0
+            return True
+        return False
+
+    def record_inference(self, seconds):
+        self.inference_time = self._smooth(self.inference_time, seconds)
+        self._retune()
+
+    def _retune(self):
+        # Pick the smallest interval N whose amortised inference cost (inference_time / N)
+        # fits inside the per-frame budget
+        budget = None
+        if self.target_fps:
+            budget = 1.0 / self.target_fps
+        if self.cpu_budget and self.frame_period:
+            cpu_share = self.cpu_budget * self.frame_period
+            budget = cpu_share if budget is None else min(budget, cpu_share)
+        if budget is None or not self.inference_time:
+            return
+        self.interval = min(self.max_interval, max(1, math.ceil(self.inference_time / budget)))
+
+    @staticmethod
+    def _smooth(current, sample, weight=0.2):
+        return sample if current is None else current + (sample - current) * weight
 
 class HandTracker:
-    def __init__(self, min_detection_confidence=0.5, min_tracking_confidence=0.5, headless_mode=False):
+    def __init__(self, min_detection_confidence=0.5, min_tracking_confidence=0.5, headless_mode=False,
+                 adaptive=False, inference_interval=3, max_inference_interval=10, motion_threshold=8.0,
+                 target_fps=None, cpu_budget=None, inference_width=None, roi=False, roi_padding=0.25,
+                 model_complexity=1, max_num_hands=2, static_image_mode=False):
+        self.config = {key: value for key, value in locals().items() if key != 'self'}  # Rebuilds workers
+        mp = MediaPipe.load()
+        self.hand_connections = mp.solutions.hands.HAND_CONNECTIONS
         self.mp_hands = mp.solutions.hands.Hands(
+            static_image_mode=static_image_mode,
+            max_num_hands=max_num_hands,
+            model_complexity=model_complexity,
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
@@ -11,6 +86,36 @@ class HandTracker:
         self.cap = None  # Video capture object
         self.headless_mode = headless_mode  # Toggle for headless mode
 
+        # Adaptive mode: full inference every N frames (or on motion), extrapolation in between.
+        # target_fps / cpu_budget (fraction of frame time spent in inference) retune N automatically.
+        self.scheduler = None
+        if adaptive:
+            self.scheduler = _AdaptiveScheduler(inference_interval, max_inference_interval,
+                                                motion_threshold, target_fps, cpu_budget)
+        self._detections = []  # Up to two (timestamp, points, handedness, scores) entries
+
+        # inference_width downscales frames before inference; roi crops to the last detected hands
+        self.region_tracker = RegionTracker(inference_width, roi, roi_padding, expected=max_num_hands)
+
+        # Preallocated result buffers, one slot per hand MediaPipe may return
+        self._points = np.zeros((max_num_hands, 21, 3), dtype=np.float32)
+        self._handedness = np.full(max_num_hands, -1, dtype=np.int8)
+        self._scores = np.zeros(max_num_hands, dtype=np.float32)
+        self._count = 0
+        self._landmarks = None  # MediaPipe's own full-frame landmarks for the buffers, when it has them
+
+    @classmethod
+    def from_tuned(cls, path=None, **overrides):
+        #Builds a tracker with the configuration saved by auto_tune, or the defaults if none is saved
+        return cls(**dict(AutoTune.load_tuned_config(cls, path), **overrides))
+
+    @classmethod
+    def auto_tune(cls, frames, target_fps=15, min_agreement=0.9, path=None, **base_config):
+        #Times candidate configurations on sample frames and saves the cheapest one meeting
+        #target_fps and agreeing with the most accurate configuration on min_agreement of frames
+        return AutoTune.tune(cls, frames, AutoTune.HAND_TRACKER_CANDIDATES, target_fps, min_agreement,
+                             path, base_config)
+
     def start_detection(self):
         #Starts the webcam and begins detecting hands
         self.cap = cv2.VideoCapture(0)
@@ -22,15 +127,13 @@ class HandTracker:
             if not ret:
                 break
 
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.mp_hands.process(rgb_frame)
-
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    self.mp_drawing.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
-                    self.draw_hand_pointer(frame, hand_landmarks)
+            points, _, _ = self.get_landmark_array(frame)
 
             if not self.headless_mode:
+                # Nothing is shown in headless mode, so skip drawing altogether
+                self.draw_landmarks(frame, points)
+                for hand_points in points:
+                    self.draw_hand_pointer(frame, hand_points)
                 cv2.imshow('Hand Detection', frame)
 
             if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -40,21 +143,125 @@ class HandTracker:
 
     def get_landmarks(self, frame):
         #Returns hand landmarks detected in the given frame
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        points, _, _ = self.get_landmark_array(frame)
+        if not len(points):
+            return None
+        # Extrapolated or ROI-cropped results only exist as arrays; convert just those
+        return self._landmarks if self._landmarks is not None else array_to_landmarks(points)
+
+    def get_landmark_array(self, frame):
+        #Returns (points, handedness, scores): a (hands, 21, 3) float32 array of normalized landmarks,
+        #handedness codes (0 left, 1 right) and their scores. These are views of buffers reused on
+        #the next call, copy them to keep results around.
+        if self.scheduler and not self.scheduler.should_infer(frame):
+            self._landmarks = None
+            self._predict(time.perf_counter())
+        else:
+            start = time.perf_counter()
+            self._infer(frame)
+            if self.scheduler:
+                self.scheduler.record_inference(time.perf_counter() - start)
+                self._remember(start)
+
+        count = self._count
+        return self._points[:count], self._handedness[:count], self._scores[:count]
+
+    def frame_result(self, frame):
+        #Per-frame record used by the offline processing API (arrays are copies)
+        points, handedness, scores = self.get_landmark_array(frame)
+        return {'points': points.copy(), 'handedness': handedness.copy(), 'scores': scores.copy()}
+
+    def process_frames(self, frames, fps=None):
+        #Yields a record per frame for any iterable of frames (or (timestamp_ms, frame) pairs), headless
+        return BatchProcessor.process_frames(self, frames, fps)
+
+    def process_video(self, path, sink, workers=None, chunk_frames=300):
+        #Processes a video file across a process pool (one MediaPipe graph per worker) and
+        #streams the records in frame order to sink: a .jsonl/.npz/.parquet path or sink object
+        config = dict(self.config, headless_mode=True)
+        return BatchProcessor.process_video(HandTracker, config, path, sink, workers, chunk_frames)
+
+    def _infer(self, frame):
+        #Runs MediaPipe on the ROI (or full frame) and fills the buffers with full-frame landmarks
+        rgb_frame, region = self.region_tracker.prepare(frame)
         results = self.mp_hands.process(rgb_frame)
-        return results.multi_hand_landmarks if results.multi_hand_landmarks else None
+        if not results.multi_hand_landmarks and self.region_tracker.is_cropped(region, frame):
+            # Track lost inside the ROI: search the full frame again
+            rgb_frame, region = self.region_tracker.prepare(frame, full_frame=True)
+            results = self.mp_hands.process(rgb_frame)
+
+        points = landmarks_to_array(results.multi_hand_landmarks, out=self._points)
+        handedness_to_array(results.multi_handedness, self._handedness, self._scores)
+        self.region_tracker.update(points, region, frame)
+        self.region_tracker.map_to_frame(points, region, frame)
+        self._count = len(points)
+        self._landmarks = None if self.region_tracker.is_cropped(region, frame) else results.multi_hand_landmarks
+
+    def _remember(self, timestamp):
+        count = self._count
+        detection = (timestamp, self._points[:count].copy(), self._handedness[:count].copy(), self._scores[:count].copy())
+        self._detections = (self._detections + [detection])[-2:]
+
+    def _predict(self, timestamp):
+        #Extrapolates landmarks linearly from the last two detections into the buffers
+        if not self._detections:
+            self._count = 0
+            return
+        last_time, last, handedness, scores = self._detections[-1]
+        count = len(last)
+        self._count = count
+        self._handedness[:count] = handedness
+        self._scores[:count] = scores
+        self._points[:count] = last  # Hands without a match in the previous detection hold still
+        if len(self._detections) < 2:
+            return
+
+        prev_time, prev, prev_handedness = self._detections[0][:3]
+        alpha = (timestamp - last_time) / max(last_time - prev_time, 1e-6)
+        alpha = min(alpha, 1.0)  # Never project further ahead than one detection gap
+        used = set()
+        for index in range(count):
+            match = self._match_hand(last[index], handedness[index], prev, prev_handedness, used)
+            if match is not None:
+                used.add(match)
+                self._points[index] += (last[index] - prev[match]) * alpha
+
+    @staticmethod
+    def _match_hand(hand, label, prev, prev_labels, used, max_distance=0.25):
+        #Index of the same hand in the previous detection: MediaPipe does not keep hands in a
+        #stable order, so match by handedness and then by nearest wrist; None if nothing is close
+        best, best_distance = None, max_distance
+        for index in range(len(prev)):
+            if index in used or (label != UNKNOWN_HAND and prev_labels[index] not in (label, UNKNOWN_HAND)):
+                continue
+            distance = float(np.hypot(*(hand[0, :2] - prev[index, 0, :2])))
+            if distance < best_distance:
+                best, best_distance = index, distance
+        return best
 
     def draw_landmarks(self, frame, landmarks):
         #Draws landmarks on the given frame
-        if landmarks:
+        #Accepts a (hands, 21, 3) landmark array or a list of MediaPipe landmark lists
+        if isinstance(landmarks, np.ndarray):
+            h, w = frame.shape[:2]
+            for hand in (landmarks[..., :2] * (w, h)).astype(int).tolist():
+                for start, end in self.hand_connections:
+                    cv2.line(frame, tuple(hand[start]), tuple(hand[end]), (224, 224, 224), 2)
+                for point in hand:
+                    cv2.circle(frame, tuple(point), 2, (0, 0, 255), 2)
+        elif landmarks:
             for hand_landmarks in landmarks:
-                self.mp_drawing.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+                self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.hand_connections)
 
     def draw_hand_pointer(self, frame, hand_landmarks):
         #Draws a line from the palm to the index finger tip to indicate pointing direction
+        #Accepts a (21, 3) landmark array or a MediaPipe landmark list
         h, w, _ = frame.shape
-        palm_x, palm_y = int(hand_landmarks.landmark[0].x * w), int(hand_landmarks.landmark[0].y * h)
-        finger_x, finger_y = int(hand_landmarks.landmark[8].x * w), int(hand_landmarks.landmark[8].y * h)
+        if isinstance(hand_landmarks, np.ndarray):
+            (palm_x, palm_y), (finger_x, finger_y) = (hand_landmarks[[0, 8], :2] * (w, h)).astype(int).tolist()
+        else:
+            palm_x, palm_y = int(hand_landmarks.landmark[0].x * w), int(hand_landmarks.landmark[0].y * h)
+            finger_x, finger_y = int(hand_landmarks.landmark[8].x * w), int(hand_landmarks.landmark[8].y * h)
 
         cv2.line(frame, (palm_x, palm_y), (finger_x, finger_y), (0, 255, 0), 3)  # Green line
         cv2.circle(frame, (finger_x, finger_y), 8, (0, 0, 255), -1)  # Red circle
@@ -65,3 +272,7 @@ class HandTracker:
             self.cap.release()
         if not self.headless_mode:
             cv2.destroyAllWindows()
+
+    def close(self):
+        #Releases the MediaPipe graph; the tracker can't detect anything afterwards
+        self.mp_hands.close()
@@ -0,0 +1,45 @@
+import numpy as np
+
+# Handedness codes used in handedness arrays
+UNKNOWN_HAND = -1
+LEFT_HAND = 0
+RIGHT_HAND = 1
+
+def landmarks_to_array(landmark_lists, out=None):
+    # Converts MediaPipe landmark lists to a (hands, points, 3) float32 array.
+    # This is the single place protobuf landmarks are read point by point; everything
+    # downstream works on the array. When out is given it is filled and a view returned.
+    if not landmark_lists:
+        if out is not None:
+            return out[:0]
+        return np.zeros((0, 21, 3), dtype=np.float32)
+
+    count = len(landmark_lists) if out is None else min(len(landmark_lists), len(out))
+    points = len(landmark_lists[0].landmark)
+    flat = np.fromiter(
+        (value for landmarks in landmark_lists[:count] for lm in landmarks.landmark for value in (lm.x, lm.y, lm.z)),
+        dtype=np.float32, count=count * points * 3
+    ).reshape(count, points, 3)
+    if out is None:
+        return flat
+    out[:count] = flat
+    return out[:count]
+
+def handedness_to_array(multi_handedness, labels_out, scores_out):
+    # Fills label codes and scores from MediaPipe handedness results, returns the hand count
+    count = 0
+    for classification in (multi_handedness or [])[:len(labels_out)]:
+        category = classification.classification[0]
+        labels_out[count] = LEFT_HAND if category.label == "Left" else RIGHT_HAND if category.label == "Right" else UNKNOWN_HAND
+        scores_out[count] = category.score
+        count += 1
+    return count
+
+def array_to_landmarks(points):
+    # Builds MediaPipe landmark lists from a (hands, points, 3) array, e.g. for mp drawing_utils
+    from mediapipe.framework.formats import landmark_pb2  # Only here, so array helpers stay light
+    return [
+        landmark_pb2.NormalizedLandmarkList(
+            landmark=[landmark_pb2.NormalizedLandmark(x=x, y=y, z=z) for x, y, z in hand.tolist()])
+        for hand in points
+    ]
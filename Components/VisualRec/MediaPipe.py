@@ -0,0 +1,28 @@
+import contextlib
+import logging
+import os
+import warnings
+
+# Loads mediapipe on first use instead of at import time, and keeps its log noise contained.
+# Importing mediapipe pulls in TensorFlow Lite and protobuf, which dominates NVLib's startup.
+
+_mp = None
+
+def load():
+    #Returns the mediapipe module, importing it with TensorFlow / absl logging turned down first
+    global _mp
+    if _mp is None:
+        os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+        logging.getLogger("tensorflow").setLevel(logging.ERROR)
+        logging.getLogger("absl").setLevel(logging.ERROR)
+        with quiet():
+            import mediapipe
+        _mp = mediapipe
+    return _mp
+
+@contextlib.contextmanager
+def quiet():
+    #Silences Python warnings and sys.stderr inside the block only, e.g. while graphs are built
+    with open(os.devnull, 'w') as devnull, warnings.catch_warnings(), contextlib.redirect_stderr(devnull):
+        warnings.simplefilter("ignore")
+        yield
@@ -0,0 +1,88 @@
+import cv2
+
+class RegionTracker:
+    # Prepares frames for MediaPipe: optionally crops to a padded box around the previous
+    # detection and downscales to a fixed inference width. Landmarks found in the crop are
+    # mapped back to normalized full-frame coordinates so callers never see the crop.
+    # While fewer objects are tracked than the model can find (max_num_hands, max_num_faces),
+    # every rescan_interval-th frame searches the full frame, so a new hand or face entering
+    # outside the crop is still picked up.
+    def __init__(self, inference_width=None, roi=False, padding=0.25, min_size=0.2, expected=1, rescan_interval=10):
+        self.inference_width = inference_width  # None keeps the capture resolution
+        self.roi = roi
+        self.padding = padding    # Fraction of the detection box added on every side
+        self.min_size = min_size  # Smallest ROI side as a fraction of the frame side
+        self.expected = expected
+        self.rescan_interval = max(1, rescan_interval)
+        self.region = None        # (x0, y0, width, height) in pixels, None = full frame
+        self.tracked = 0          # Objects found by the last update
+        self._cropped_frames = 0  # Frames in a row run on the crop
+
+    def reset(self):
+        self.region = None
+        self.tracked = 0
+
+    def prepare(self, frame, full_frame=False):
+        #Returns the RGB image to run inference on and the pixel region it covers
+        h, w = frame.shape[:2]
+        if self.roi and self.region and not full_frame and self.tracked < self.expected:
+            self._cropped_frames += 1
+            full_frame = self._cropped_frames >= self.rescan_interval
+        if self.roi and self.region and not full_frame:
+            x0, y0, cw, ch = self.region
+        else:
+            self._cropped_frames = 0
+            x0, y0, cw, ch = 0, 0, w, h
+
+        image = frame[y0:y0 + ch, x0:x0 + cw]
+        if self.inference_width and cw > self.inference_width:
+            scaled_h = max(1, round(ch * self.inference_width / cw))
+            image = cv2.resize(image, (self.inference_width, scaled_h), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB), (x0, y0, cw, ch)
+
+    def is_cropped(self, region, frame):
+        h, w = frame.shape[:2]
+        return region != (0, 0, w, h)
+
+    def map_to_frame(self, points, region, frame):
+        #Rewrites a (hands, points, 3) array of crop-normalized landmarks in place as full-frame ones
+        if not len(points) or not self.is_cropped(region, frame):
+            return points
+        h, w = frame.shape[:2]
+        x0, y0, cw, ch = region
+        points *= (cw / w, ch / h, cw / w)  # z shares the x scale in MediaPipe
+        points[..., :2] += (x0 / w, y0 / h)
+        return points
+
+    def update(self, points, region, frame):
+        #Moves the ROI to follow the detections (array in crop coordinates), or drops it when lost
+        if not self.roi:
+            return
+        self.tracked = 0 if points is None else len(points)
+        if not self.tracked:
+            self.region = None
+            return
+
+        h, w = frame.shape[:2]
+        x0, y0, cw, ch = region
+        xs, ys = points[..., 0], points[..., 1]
+        left, right = x0 + float(xs.min()) * cw, x0 + float(xs.max()) * cw
+        top, bottom = y0 + float(ys.min()) * ch, y0 + float(ys.max()) * ch
+
+        # Keep the current ROI while the detection stays well inside it; a stable crop
+        # lets MediaPipe's own tracker carry over between frames
+        if self.region:
+            rx, ry, rw, rh = self.region
+            mx, my = rw * self.padding / 4, rh * self.padding / 4
+            if rx + mx <= left and right <= rx + rw - mx and ry + my <= top and bottom <= ry + rh - my:
+                return
+
+        pad_x = max((right - left) * self.padding, 1)
+        pad_y = max((bottom - top) * self.padding, 1)
+        new_w = max(right - left + 2 * pad_x, w * self.min_size)
+        new_h = max(bottom - top + 2 * pad_y, h * self.min_size)
+        cx, cy = (left + right) / 2, (top + bottom) / 2
+
+        nx0 = int(max(0, min(cx - new_w / 2, w - new_w)))
+        ny0 = int(max(0, min(cy - new_h / 2, h - new_h)))
+        self.region = (nx0, ny0, int(min(new_w, w - nx0)), int(min(new_h, h - ny0)))
@@ -0,0 +1,212 @@
+import cv2
+import os
+import threading
+import time
+from collections import deque
+
+# Runs many camera / file / URL streams through a fixed pool of inference workers, so CPU use is
+# bounded by the worker count no matter how many streams are attached. Every stream owns its own
+# detector (one set of MediaPipe graphs per stream, so memory grows with the stream count):
+# MediaPipe tracking, ROI crops and adaptive extrapolation all carry state from one frame to the
+# next, and sharing a detector would mix that state between cameras. Each stream keeps only
+# its newest frame: frames that arrive while the stream waits for a worker or its frame-rate cap
+# are dropped and counted.
+
+class _Stream:
+    def __init__(self, name, source, max_fps, priority, realtime):
+        self.name = name
+        self.source = source
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.priority = priority
+        self.realtime = realtime  # Pace file sources at their native frame rate
+        self.detector = None
+
+        self.frame = None
+        self.frame_index = -1
+        self.captured_at = None
+        self.busy = False       # One frame per stream in flight keeps results in order
+        self.finished = False
+        self.next_due = 0.0
+        self.last_served = 0.0
+
+        self.captured = 0
+        self.processed = 0
+        self.dropped = 0
+        self.started_at = None
+        self.latencies = deque(maxlen=1000)
+
+class StreamScheduler:
+    def __init__(self, detector_class, config=None, workers=2, policy='fair', on_result=None):
+        if policy not in ('fair', 'priority'):
+            raise ValueError("policy must be 'fair' or 'priority'")
+        self.detector_class = detector_class
+        self.config = config or {}
+        self.workers = workers
+        self.policy = policy
+        self.on_result = on_result  # on_result(stream_name, frame_index, captured_at, result)
+
+        self.streams = {}
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads = []
+        self._readers = []
+
+    def add_stream(self, name, source, max_fps=None, priority=0, realtime=None):
+        #source: device index, video file path or stream URL. Higher priority is served first
+        #under the 'priority' policy; max_fps caps how often the stream is processed.
+        #Streams added after start() begin processing right away.
+        if name in self.streams:
+            raise ValueError(f"Stream '{name}' already exists.")
+        if realtime is None:
+            realtime = isinstance(source, str) and os.path.exists(source)
+        stream = _Stream(name, source, max_fps, priority, realtime)
+        running = bool(self._threads)
+        if running:
+            stream.detector = self.detector_class(**self.config)
+        with self._cond:  # Workers walk the streams while holding the lock
+            self.streams[name] = stream
+        if running:
+            self._start_reader(stream)
+
+    def start(self):
+        self._stopping = False
+        for stream in self.streams.values():
+            if stream.detector is None:
+                stream.detector = self.detector_class(**self.config)
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        for stream in list(self.streams.values()):
+            self._start_reader(stream)
+
+    def _start_reader(self, stream):
+        reader = threading.Thread(target=self._read, args=(stream,), daemon=True)
+        reader.start()
+        self._readers.append(reader)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads + self._readers:
+            thread.join()
+        self._threads, self._readers = [], []
+
+    def wait(self, timeout=None):
+        #Blocks until every stream has ended and its last frame is processed, then stops the workers
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not all(s.finished and s.frame is None and not s.busy for s in self.streams.values()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        self.stop()
+        return True
+
+    def stats(self):
+        #Per-stream counters, processed FPS and capture-to-result latency percentiles
+        report = {}
+        with self._cond:
+            for name, s in self.streams.items():
+                latencies = sorted(s.latencies)
+                elapsed = time.perf_counter() - s.started_at if s.started_at else 0.0
+                report[name] = {
+                    'captured': s.captured,
+                    'processed': s.processed,
+                    'dropped': s.dropped,
+                    'fps': s.processed / elapsed if elapsed else 0.0,
+                    'latency_p50_ms': _percentile(latencies, 0.50) * 1000.0 if latencies else None,
+                    'latency_p95_ms': _percentile(latencies, 0.95) * 1000.0 if latencies else None,
+                }
+        return report
+
+    def _read(self, stream):
+        cap = cv2.VideoCapture(stream.source)
+        if not cap.isOpened():
+            print(f"Error: Could not open stream '{stream.name}' ({stream.source}).")
+        period = 0.0
+        if stream.realtime:
+            period = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        stream.started_at = time.perf_counter()
+
+        next_read = time.perf_counter()
+        while cap.isOpened() and not self._stopping:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            with self._cond:
+                if stream.frame is not None:
+                    stream.dropped += 1  # Superseded before a worker got to it
+                stream.frame = frame
+                stream.frame_index += 1
+                stream.captured += 1
+                stream.captured_at = time.perf_counter()
+                self._cond.notify()
+            if period:
+                next_read += period
+                time.sleep(max(0.0, next_read - time.perf_counter()))
+
+        cap.release()
+        with self._cond:
+            stream.finished = True
+            self._cond.notify_all()
+
+    def _next_stream(self, now):
+        #Returns (stream ready to process, seconds until a capped stream becomes due)
+        ready, wait_for = [], None
+        for stream in self.streams.values():
+            if stream.frame is None or stream.busy:
+                continue
+            if stream.next_due > now:
+                delay = stream.next_due - now
+                wait_for = delay if wait_for is None else min(wait_for, delay)
+                continue
+            ready.append(stream)
+        if not ready:
+            return None, wait_for
+        if self.policy == 'priority':
+            return min(ready, key=lambda s: (-s.priority, s.last_served)), None
+        return min(ready, key=lambda s: s.last_served), None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    now = time.perf_counter()
+                    stream, wait_for = self._next_stream(now)
+                    if stream:
+                        break
+                    self._cond.wait(wait_for)
+
+                frame, index, captured_at = stream.frame, stream.frame_index, stream.captured_at
+                stream.frame = None
+                stream.busy = True
+                stream.last_served = now
+                stream.next_due = now + stream.min_interval
+
+            result = None
+            try:
+                # busy keeps the stream's detector with this worker until the frame is done
+                result = stream.detector.frame_result(frame)
+                if result is not None and self.on_result:
+                    try:
+                        self.on_result(stream.name, index, captured_at, result)
+                    except Exception as e:
+                        print(f"Error in on_result for stream '{stream.name}': {e}")
+            except Exception as e:
+                print(f"Error processing stream '{stream.name}': {e}")
+                result = None
+            finally:
+                with self._cond:
+                    stream.busy = False
+                    if result is not None:
+                        stream.processed += 1
+                        stream.latencies.append(time.perf_counter() - captured_at)
+                    self._cond.notify_all()
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
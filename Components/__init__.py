@@ -0,0 +1,35 @@
+import importlib
+
+# NVLib components by name, e.g. `from NVLib.Components import TinyDB`. Each one is imported the
+# first time it is used, so a script that only needs TinyDB never loads OpenCV, MediaPipe,
+# pygame, Firebase or CustomTkinter. The full module paths keep working as before.
+
+_LAZY_NAMES = {
+    # name: (module, attribute or None for the module itself)
+    'TinyDB': ('.Database.Tinydb', 'TinyDB'),
+    'MariaDB': ('.Database.Mariadb', 'MariaDB'),
+    'Auth': ('.Authentication.FirebaseAuth', 'Auth'),
+    'AutoGUI': ('.GUI.AutoGUI', 'AutoGUI'),
+    'compile_layout': ('.GUI.LayoutCompiler', 'compile_layout'),
+    'TextToSpeech': ('.Audio.TextToSpeech', None),
+    'Speaker': ('.Audio.TextToSpeech', 'Speaker'),
+    'HandTracker': ('.VisualRec.HandTracker', 'HandTracker'),
+    'FaceHandDetector': ('.VisualRec.FLRH', 'FaceHandDetector'),
+    'StreamScheduler': ('.VisualRec.StreamScheduler', 'StreamScheduler'),
+    'DetectionEventStream': ('.VisualRec.DetectionEvents', 'DetectionEventStream'),
+    'hand_features': ('.VisualRec.GestureFeatures', 'hand_features'),
+}
+
+__all__ = sorted(_LAZY_NAMES)
+
+def __getattr__(name):
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    module_name, attribute = _LAZY_NAMES[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))